@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# bench-scroll-latency.py
+# Latency/correctness benchmark for the xinput-plus scroll pipeline (development only, not installed).
+#
+# Creates a virtual wheel mouse with uinput, runs a ScrollPipeline on it (grab +
+# uinput clone), injects wheel events into the source and reads them back from
+# the clone. Reports the added per-event delay and checks the multiplied values.
+# No X server is needed; it needs python3-evdev and write access to /dev/uinput
+# and the /dev/input/event* nodes (root, or the 'input' group plus a uinput rule).
+#
+# Usage:
+#   python3 tools/bench-scroll-latency.py [--events=5000] [--multiplier=-1.5] [--max-p99-us=1000]
+#
+# Exit status is 1 when p99 latency exceeds --max-p99-us or the values are wrong,
+# 2 when uinput is not usable here.
+
+import importlib.util
+import select
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import evdev
+from evdev import ecodes
+
+HERE = Path(__file__).resolve().parent
+SCRIPT = HERE.parent / "xinput-plus.py"
+
+
+def load_app_module():
+    """Import xinput-plus.py (hyphenated filename) as a module."""
+    spec = importlib.util.spec_from_file_location("xinput_plus", SCRIPT)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def parse_opt(argv: List[str], name: str, default: float) -> float:
+    for arg in argv[1:]:
+        if arg.startswith(f"--{name}="):
+            return float(arg.split("=", 1)[1])
+    return default
+
+
+def wait_for_device(name: str, timeout: float = 3.0) -> evdev.InputDevice:
+    """Find an input device by name once udev has created its node."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for path in evdev.list_devices():
+            dev = evdev.InputDevice(path)
+            if dev.name == name:
+                return dev
+            dev.close()
+        time.sleep(0.05)
+    raise SystemExit(f"device {name!r} did not appear")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main() -> int:
+    count = int(parse_opt(sys.argv, "events", 5000))
+    multiplier = parse_opt(sys.argv, "multiplier", -1.5)
+    max_p99 = parse_opt(sys.argv, "max-p99-us", 1000.0)
+
+    mod = load_app_module()
+    mod.debug = lambda msg: print(f"[xinput-plus] {msg}")
+
+    caps = {ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_RIGHT],
+            ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y, ecodes.REL_WHEEL, ecodes.REL_WHEEL_HI_RES]}
+    try:
+        source = evdev.UInput(caps, name="xinput-plus bench wheel")
+    except (OSError, evdev.UInputError) as e:
+        print(f"cannot create a uinput device: {e}")
+        return 2
+    try:
+        node = wait_for_device("xinput-plus bench wheel").path
+        pipe = mod.ScrollPipeline(node, multiplier)
+        if not pipe.start():
+            return 1
+        try:
+            clone = wait_for_device(f"xinput-plus bench wheel {mod.SCROLL_DEVICE_SUFFIX}")
+            poller = select.poll()
+            poller.register(clone.fd, select.POLLIN)
+
+            latencies: List[float] = []
+            total_in = total_out = 0
+            for _ in range(count):
+                t0 = time.perf_counter_ns()
+                source.write(ecodes.EV_REL, ecodes.REL_WHEEL_HI_RES, 120)
+                source.syn()
+                got = False
+                while not got:
+                    if not poller.poll(1000):
+                        print("timeout waiting for the clone's event")
+                        return 1
+                    for ev in clone.read():
+                        if ev.type == ecodes.EV_REL and ev.code == ecodes.REL_WHEEL_HI_RES:
+                            total_out += ev.value
+                        if ev.type == ecodes.EV_SYN:
+                            got = True
+                latencies.append((time.perf_counter_ns() - t0) / 1000.0)
+                total_in += 120
+            clone.close()
+        finally:
+            pipe.stop()
+    finally:
+        source.close()
+
+    expected = int(total_in * pipe.multiplier)
+    p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+    print(f"events: {count}  multiplier: {pipe.multiplier:g}")
+    print(f"round trip per event (us): p50 {p50:.1f}  p99 {p99:.1f}  max {max(latencies):.1f}  (limit p99 {max_p99:g})")
+    print(f"hi-res wheel total: in {total_in}  out {total_out}  expected {expected}")
+    ok = p99 <= max_p99 and abs(total_out - expected) <= 1
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
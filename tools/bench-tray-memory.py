@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# bench-tray-memory.py
+# Resident-memory benchmark for xinput-plus tray mode (development only, not installed).
+#
+# Simulates a long tray session in compressed time: every "tick" is one background
+# scan (TRAY_WATCH_INTERVAL_MS apart in real life); every few ticks a device is
+# unplugged or replugged with a new X id; once per simulated hour the main window
+# is opened and closed again. xinput is replaced by a no-op, and the config/cache
+# files go to a temporary directory, so the benchmark is safe to run anywhere.
+#
+# Usage:
+#   QT_QPA_PLATFORM=offscreen python3 tools/bench-tray-memory.py [--hours=8] [--max-growth-kib=2048]
+#
+# Exit status is 1 when RSS grew by more than --max-growth-kib after warm-up.
+
+import gc
+import importlib.util
+import os
+import resource
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+HERE = Path(__file__).resolve().parent
+SCRIPT = HERE.parent / "xinput-plus.py"
+
+
+def load_app_module():
+    """Import xinput-plus.py (hyphenated filename) as a module."""
+    spec = importlib.util.spec_from_file_location("xinput_plus", SCRIPT)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def rss_kib() -> int:
+    """Current resident set size in KiB (Linux /proc)."""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() // 1024
+
+
+def parse_opt(argv: List[str], name: str, default: float) -> float:
+    for arg in argv[1:]:
+        if arg.startswith(f"--{name}="):
+            return float(arg.split("=", 1)[1])
+    return default
+
+
+def main() -> int:
+    hours = parse_opt(sys.argv, "hours", 8.0)
+    max_growth = parse_opt(sys.argv, "max-growth-kib", 2048.0)
+
+    app = QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+    mod = load_app_module()
+
+    tmp = Path(tempfile.mkdtemp(prefix="xinput-plus-bench-"))
+    mod.CONFIG_PATH = tmp / "xinput-plus.json"
+    mod.DEVICE_CACHE_PATH = tmp / "xinput-plus-devices.json"
+    mod.debug = lambda msg: None
+    mod.run_cmd = lambda cmd: ""
+
+    caps = list(mod.CAPABILITY_PROPS)
+    fixed = [
+        {"name": "Touchpad", "id": "11", "caps": caps},
+        {"name": "USB Optical Mouse", "id": "12", "caps": caps},
+    ]
+
+    manager = mod.DeviceManager()
+    manager.config["by_name"]["Logitech K400"] = {"speed": 0.5, "extended": False,
+                                                  "natural": False, "tapping": True}
+    tray = mod.TrayApp(manager)
+    manager.set_devices(list(fixed), stale=False)
+
+    ticks_per_hour = int(3600 * 1000 / mod.TRAY_WATCH_INTERVAL_MS)
+    total_ticks = int(hours * ticks_per_hour)
+    replug_every = 40  # ~2 minutes of simulated time
+    next_id = 20
+    plugged: Optional[dict] = None
+
+    samples = []
+    baseline = None
+    for tick in range(total_ticks):
+        if tick % replug_every == 0:
+            if plugged is None:
+                plugged = {"name": "Logitech K400", "id": str(next_id), "caps": caps}
+                next_id += 1
+            else:
+                plugged = None
+        devices = [dict(d) for d in fixed] + ([dict(plugged)] if plugged else [])
+        manager.on_devices_scanned(devices)
+
+        if tick % ticks_per_hour == ticks_per_hour // 2:
+            tray.open_window()
+            app.processEvents()
+            tray._window.close()
+        app.processEvents()
+
+        if tick % ticks_per_hour == 0:
+            gc.collect()
+            rss = rss_kib()
+            samples.append(rss)
+            if tick == ticks_per_hour:  # first hour is warm-up (imports, Qt caches)
+                baseline = rss
+
+    gc.collect()
+    app.processEvents()
+    final = rss_kib()
+    baseline = baseline if baseline is not None else samples[0]
+    growth = final - baseline
+
+    print(f"simulated hours: {hours:g}  scans: {total_ticks}  replugs: {next_id - 20}")
+    print(f"RSS per hour (KiB): {' '.join(str(s) for s in samples)}")
+    print(f"RSS baseline {baseline} KiB, final {final} KiB, peak {max(samples + [final])} KiB, "
+          f"growth {growth} KiB (limit {max_growth:g})")
+    return 0 if growth <= max_growth else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,14 +9,33 @@
 # - Filters out Virtual/Master/XTEST pointers.
 # - Uses "libinput Accel Speed" when available; falls back to CTM matrix otherwise.
 # - Applies saved configs automatically on startup (after a short delay).
+# - Paints the last known device list instantly, then revalidates it in the background.
+# - Optional tray-resident mode (--tray): window built on demand, speed presets in the menu.
+# - Optional scroll multiplier: evdev → uinput pipeline per device (needs python3-evdev).
+# - Measurement mode (--probe): effective gain curve and apply latency from XI2 events (needs python3-xlib).
 # - English source strings with self.tr(...) for i18n; QTranslator loader keeps references.
 #
 # Config file (~/.config/xinput-plus.json):
 # {
-#   "by_name": { "<name>": {"speed": float, "extended": bool} },
-#   "by_id":   { "<id>":   {"speed": float, "extended": bool} },
-#   "_whitelist": [ {"name": "<name>", "id": "<id>"} ],
-#   "_show_only_whitelist": true/false
+#   "by_name": { "<name>": {"speed": float, "extended": bool, "curve_enabled": bool, "curve": {...},
+#                            "scroll_multiplier": float} },
+#   "by_id":   { "<id>":   {"speed": float, "extended": bool, "name": "<name>", "last_seen": int} },
+#   "_whitelist": [ {"name": "<name>", "id": "<id>", "last_seen": int} ],
+#   "_show_only_whitelist": true/false,
+#   "_retention": {"max_age_days": int, "max_by_id": int, "max_whitelist": int}
+# }
+#
+# "curve" is a custom acceleration curve, either
+#   {"type": "parametric", "gain": g, "accel": a, "exponent": e, "max_speed": m}  (y = g*x + a*x^e)
+#   {"type": "points", "points": [[x, y], ...]}                                   (piecewise linear)
+# with x = device speed (units/ms) and y = pointer speed.
+#
+# X ids are transient, so by_id and _whitelist entries carry a last_seen Unix
+# timestamp and are evicted by age and count (see gc_config / --gc).
+#
+# Device cache (~/.config/xinput-plus-devices.json), rewritten after each scan:
+# {
+#   "devices": [ {"name": "<name>", "id": "<id>", "caps": ["<xinput property>", ...]} ]
 # }
 #
 # NOTE: Wayland is not supported by xinput; run under Xorg.
@@ -25,22 +44,66 @@
 import sys
 import subprocess
 import json
+import time
+import contextlib
+import copy
+import functools
+import math
+import os
+import select
+import struct
+import threading
+from fractions import Fraction
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Set
 
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
     QLabel, QSlider, QPushButton, QMessageBox, QCheckBox, QDialog, QDialogButtonBox,
-    QAbstractItemView
+    QAbstractItemView, QSystemTrayIcon, QMenu, QSpinBox, QDoubleSpinBox, QComboBox,
+    QStackedWidget, QPlainTextEdit, QFormLayout
 )
 from PyQt6.QtCore import (
-    Qt, QTimer, QLocale, QTranslator, QLibraryInfo, QCoreApplication, QStandardPaths
+    Qt, QTimer, QLocale, QTranslator, QLibraryInfo, QCoreApplication, QStandardPaths,
+    QObject, QThread, pyqtSignal, QPointF
 )
-from PyQt6.QtGui import QIcon
+from PyQt6.QtGui import QIcon, QAction, QPainter, QPen, QPolygonF
+
+try:
+    import numpy as np
+except ImportError:  # optional: curves are then sampled in plain Python
+    np = None
+
+try:
+    import evdev
+except ImportError:  # optional: the user-space scroll multiplier is then unavailable
+    evdev = None
+
+try:
+    from Xlib import X, display as xdisplay, error as xerror
+    from Xlib.ext import xinput as xi, xtest
+except ImportError:  # optional: the --probe measurement mode is then unavailable
+    xdisplay = None
 
 CONFIG_PATH = Path.home() / ".config" / "xinput-plus.json"
+DEVICE_CACHE_PATH = Path.home() / ".config" / "xinput-plus-devices.json"
 APP_NAME = "xinput-plus"  # used for i18n and data dirs
 
+# Properties probed once per device during a scan and remembered as capabilities.
+CAPABILITY_PROPS = (
+    "libinput Accel Speed",
+    "libinput Natural Scrolling Enabled",
+    "libinput Tapping Enabled",
+    "Coordinate Transformation Matrix",
+    "libinput Accel Profile Enabled",
+    "libinput Accel Custom Motion Points",
+)
+
+# Retention limits for id-keyed entries; overridable per user in config["_retention"].
+RETENTION_DEFAULTS = {"max_age_days": 180, "max_by_id": 32, "max_whitelist": 64}
+# last_seen is only rewritten when older than this, so scans don't rewrite the config.
+LAST_SEEN_RESOLUTION = 24 * 3600
+
 
 # --------------------------
 # Helpers & config migration
@@ -100,6 +163,563 @@ def _migrate_old_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
     out["by_name"] = by_name
     return out
 
+def read_config() -> Dict[str, Any]:
+    """Load config JSON and migrate legacy shape if needed."""
+    try:
+        if CONFIG_PATH.exists():
+            raw = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+            return _migrate_old_config(raw)
+    except Exception as e:
+        debug(f"Error reading config: {e}")
+    return {"by_name": {}, "by_id": {}, "_whitelist": [], "_show_only_whitelist": False}
+
+def write_config(cfg: Dict[str, Any]) -> None:
+    """Persist config JSON to disk."""
+    try:
+        CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CONFIG_PATH.write_text(json.dumps(cfg, indent=2, ensure_ascii=False), encoding="utf-8")
+    except Exception as e:
+        debug(f"Error saving config: {e}")
+
+
+# --------------------------
+# Scroll multiplier (evdev → uinput)
+# --------------------------
+
+# Name suffix of the virtual device each pipeline creates; it gets the original's profile.
+SCROLL_DEVICE_SUFFIX = "(xinput-plus scroll)"
+SCROLL_BATCH = 64             # events read per syscall
+SCROLL_MAX_DENOMINATOR = 120  # multipliers are rounded to n/120 (one hi-res wheel unit)
+
+# struct input_event: struct timeval time; __u16 type; __u16 code; __s32 value;
+_EVENT_SIZE = struct.calcsize("llHHi")
+_TYPE_OFF = struct.calcsize("ll")
+_EV_REL = 0x02
+_REL_HWHEEL, _REL_WHEEL, _REL_WHEEL_HI_RES, _REL_HWHEEL_HI_RES = 0x06, 0x08, 0x0b, 0x0c
+# REL code → accumulator slot (-1: not a scroll axis)
+_SCROLL_SLOT = [-1] * 16
+for _slot, _code in enumerate((_REL_WHEEL, _REL_HWHEEL, _REL_WHEEL_HI_RES, _REL_HWHEEL_HI_RES)):
+    _SCROLL_SLOT[_code] = _slot
+
+def scroll_available() -> bool:
+    """True when python-evdev is installed (access to /dev/uinput is checked on start)."""
+    return evdev is not None
+
+def scroll_multiplier(cfg: Dict[str, Any]) -> float:
+    """
+    A profile's scroll multiplier: 1.0 (off) when unset, malformed or 0, else at
+    least one hi-res unit (1/SCROLL_MAX_DENOMINATOR) in size so wheel events are never dropped.
+    """
+    try:
+        mult = float(cfg.get("scroll_multiplier", 1.0))
+    except (TypeError, ValueError):
+        return 1.0
+    if mult == 0.0 or not math.isfinite(mult):
+        return 1.0
+    return math.copysign(max(abs(mult), 1.0 / SCROLL_MAX_DENOMINATOR), mult)
+
+def profile_name(name: str) -> str:
+    """Profile name for a device: a scroll pipeline's virtual device uses the original's."""
+    if name.endswith(SCROLL_DEVICE_SUFFIX):
+        return name[:-len(SCROLL_DEVICE_SUFFIX)].rstrip()
+    return name
+
+def device_node(device_id: str) -> Optional[str]:
+    """The /dev/input/eventN node behind an X device, from its 'Device Node' property."""
+    for line in run_cmd(["xinput", "list-props", device_id]).splitlines():
+        if "Device Node" in line and '"' in line:
+            return line.split('"')[1]
+    return None
+
+
+class ScrollPipeline:
+    """
+    Grabs an evdev device and re-emits its events on a uinput clone with the
+    scroll axes multiplied (negative multiplier = inverted). The hot loop reads
+    up to SCROLL_BATCH raw input_event structs per syscall into one preallocated
+    buffer, rewrites wheel values in place with integer math (fractional parts
+    are carried over, nothing is lost) and writes the batch back unchanged in size.
+    """
+    def __init__(self, node: str, multiplier: float) -> None:
+        self.node = node
+        self.set_multiplier(multiplier)
+        self._acc = [0, 0, 0, 0]  # carried remainders per scroll axis
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._src = None
+        self._ui = None
+
+    def set_multiplier(self, multiplier: float) -> None:
+        # Below one hi-res unit the ratio would round to 0 and swallow every wheel event
+        multiplier = math.copysign(max(abs(multiplier), 1.0 / SCROLL_MAX_DENOMINATOR), multiplier)
+        frac = Fraction(multiplier).limit_denominator(SCROLL_MAX_DENOMINATOR)
+        self.multiplier = float(frac)
+        self._ratio = (frac.numerator, frac.denominator)  # swapped atomically
+
+    def start(self) -> bool:
+        """Grab the device and create the virtual clone; False (and logged) on failure."""
+        try:
+            self._src = evdev.InputDevice(self.node)
+            self._ui = evdev.UInput.from_device(self._src, name=f"{self._src.name} {SCROLL_DEVICE_SUFFIX}")
+            self._src.grab()
+        except (OSError, evdev.UInputError) as e:
+            debug(f"Scroll pipeline for {self.node} not started: {e}")
+            self.close()
+            return False
+        self._thread = threading.Thread(target=self.pump, args=(self._src.fd, self._ui.fd),
+                                        name=f"scroll {self.node}", daemon=True)
+        self._thread.start()
+        return True
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self) -> None:
+        """Stop the loop, ungrab the device and remove the virtual clone."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.close()
+
+    def close(self) -> None:
+        for closer in (lambda: self._src.ungrab(), lambda: self._src.close(), lambda: self._ui.close()):
+            try:
+                closer()
+            except Exception:
+                pass
+        self._src = self._ui = None
+
+    def pump(self, src_fd: int, dst_fd: int) -> None:
+        """Copy events from src_fd to dst_fd, scaling scroll axes, until stopped or the device goes away."""
+        buf = bytearray(_EVENT_SIZE * SCROLL_BATCH)
+        view = memoryview(buf)
+        shorts, ints = view.cast("H"), view.cast("i")
+        ev_shorts, ev_ints = _EVENT_SIZE // 2, _EVENT_SIZE // 4
+        type_idx, code_idx, value_idx = _TYPE_OFF // 2, _TYPE_OFF // 2 + 1, _TYPE_OFF // 4 + 1
+        slots, acc = _SCROLL_SLOT, self._acc
+        poller = select.poll()
+        poller.register(src_fd, select.POLLIN)
+
+        while not self._stop.is_set():
+            if not poller.poll(200):
+                continue
+            try:
+                n = os.readv(src_fd, [buf])
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                debug(f"Scroll pipeline for {self.node} stopped: {e}")
+                break
+            if n <= 0:
+                break
+
+            num, den = self._ratio
+            for i in range(n // _EVENT_SIZE):
+                if shorts[i * ev_shorts + type_idx] != _EV_REL:
+                    continue
+                code = shorts[i * ev_shorts + code_idx]
+                slot = slots[code] if code < 16 else -1
+                if slot < 0:
+                    continue
+                a = acc[slot] + ints[i * ev_ints + value_idx] * num
+                q = a // den if a >= 0 else -((-a) // den)  # truncate toward zero
+                acc[slot] = a - q * den
+                ints[i * ev_ints + value_idx] = q
+
+            try:
+                os.write(dst_fd, view[:n])
+            except OSError as e:
+                debug(f"Scroll pipeline for {self.node} stopped: {e}")
+                break
+
+
+# --------------------------
+# Retention (by_id / _whitelist)
+# --------------------------
+
+def retention_limits(cfg: Dict[str, Any]) -> Dict[str, int]:
+    """RETENTION_DEFAULTS overlaid with the user's config["_retention"]."""
+    limits = dict(RETENTION_DEFAULTS)
+    user = cfg.get("_retention", {})
+    if isinstance(user, dict):
+        for k in limits:
+            try:
+                limits[k] = int(user[k])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return limits
+
+def id_profile(cfg: Dict[str, Any], name: str, dev_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    The by_id profile for dev_id, unless it was saved for a different device name
+    (X reuses ids, so a stale entry must not match whatever got the id next).
+    """
+    if not dev_id:
+        return None
+    entry = cfg.get("by_id", {}).get(dev_id)
+    if not isinstance(entry, dict) or entry.get("name", name) != name:
+        return None
+    return entry
+
+def _last_seen(entry: Dict[str, Any], default: int) -> int:
+    """entry["last_seen"] as an int; default when missing or malformed (hand-edited config)."""
+    try:
+        return int(entry["last_seen"])
+    except (KeyError, TypeError, ValueError):
+        return default
+
+def mark_seen(cfg: Dict[str, Any], devices: List[dict], now: Optional[int] = None) -> bool:
+    """Refresh last_seen of entries matching connected devices; True if cfg changed."""
+    now = int(time.time()) if now is None else now
+    changed = False
+    for dev in devices:
+        entry = id_profile(cfg, dev["name"], dev["id"])
+        if entry is not None and now - _last_seen(entry, 0) >= LAST_SEEN_RESOLUTION:
+            entry["last_seen"] = now
+            changed = True
+
+    connected = {(d["name"], d["id"]) for d in devices}
+    for entry in cfg.get("_whitelist", []):
+        if not isinstance(entry, dict):
+            continue
+        key = (str(entry.get("name")), str(entry.get("id")))
+        if key in connected and now - _last_seen(entry, 0) >= LAST_SEEN_RESOLUTION:
+            entry["last_seen"] = now
+            changed = True
+    return changed
+
+def _entry_age_days(entry: Dict[str, Any], now: int) -> int:
+    return max(0, now - _last_seen(entry, now)) // (24 * 3600)
+
+def evict_by_id(cfg: Dict[str, Any], max_entries: int, keep_since: Optional[int] = None,
+                keep: Optional[str] = None) -> List[str]:
+    """
+    Drop the least recently seen by_id entries beyond max_entries; return report lines.
+    Entries with last_seen >= keep_since (their order is unknown) and the entry
+    `keep` (the one being written) are never dropped.
+    """
+    by_id = cfg.get("by_id", {})
+    report: List[str] = []
+    if len(by_id) <= max_entries:
+        return report
+    last_seen = {k: _last_seen(by_id[k], 0) if isinstance(by_id[k], dict) else 0 for k in by_id}
+    lru = sorted((k for k in by_id if k != keep and (keep_since is None or last_seen[k] < keep_since)),
+                 key=last_seen.get)
+    excess = len(by_id) - max_entries
+    for dev_id in lru[:excess]:
+        entry = by_id.pop(dev_id)
+        label = entry.get("name", "?") if isinstance(entry, dict) else "?"
+        report.append(f"removed by_id {dev_id} ({label}): over limit of {max_entries} (least recently seen)")
+    if excess > len(lru):
+        report.append(f"kept {len(by_id)} by_id entries over the limit of {max_entries}: "
+                      f"seen or first dated in this run (run --gc later)")
+    return report
+
+def gc_config(cfg: Dict[str, Any], now: Optional[int] = None,
+              limits: Optional[Dict[str, int]] = None) -> List[str]:
+    """
+    Apply the retention policy in place: age limit for by_id and _whitelist entries,
+    then count limits (least recently seen first). Entries without last_seen are
+    stamped now, and entries dated now are exempt from the count limits, so the
+    run that upgrades an old config never deletes anything. Returns report lines.
+    """
+    now = int(time.time()) if now is None else now
+    limits = limits or retention_limits(cfg)
+    max_age = limits["max_age_days"]
+    report: List[str] = []
+
+    by_id = cfg.setdefault("by_id", {})
+    for dev_id in list(by_id):
+        entry = by_id[dev_id]
+        if not isinstance(entry, dict):
+            del by_id[dev_id]
+            report.append(f"removed by_id {dev_id}: malformed entry")
+            continue
+        entry["last_seen"] = _last_seen(entry, now)
+        age = _entry_age_days(entry, now)
+        if age > max_age:
+            del by_id[dev_id]
+            report.append(f"removed by_id {dev_id} ({entry.get('name', '?')}): not seen for {age} days")
+    report.extend(evict_by_id(cfg, limits["max_by_id"], keep_since=now))
+
+    kept: List[dict] = []
+    for entry in cfg.get("_whitelist", []):
+        if not isinstance(entry, dict) or "name" not in entry or "id" not in entry:
+            report.append("removed whitelist entry: malformed")
+            continue
+        entry["last_seen"] = _last_seen(entry, now)
+        age = _entry_age_days(entry, now)
+        if age > max_age:
+            report.append(f"removed whitelist {entry['name']} (id {entry['id']}): not seen for {age} days")
+            continue
+        kept.append(entry)
+    if len(kept) > limits["max_whitelist"]:
+        kept.sort(key=lambda e: int(e["last_seen"]), reverse=True)
+        dropped = [e for e in kept[limits["max_whitelist"]:] if int(e["last_seen"]) < now]
+        for entry in dropped:
+            report.append(f"removed whitelist {entry['name']} (id {entry['id']}): "
+                          f"over limit of {limits['max_whitelist']} (least recently seen)")
+        kept = kept[:len(kept) - len(dropped)]  # newest first, so the dropped ones are the tail
+        if len(kept) > limits["max_whitelist"]:
+            report.append(f"kept {len(kept)} whitelist entries over the limit of {limits['max_whitelist']}: "
+                          f"seen or first dated in this run (run --gc later)")
+    cfg["_whitelist"] = kept
+    return report
+
+
+# --------------------------
+# Acceleration curves
+# --------------------------
+
+CURVE_NPOINTS = 64            # libinput's maximum number of custom motion points
+CURVE_MAX_VALUE = 10000.0     # upper bound for speeds/points accepted by libinput
+CURVE_FLAT_RANGE = 20.0       # device speeds (units/ms) used to fit the flat-profile gain
+CURVE_MIN_GAIN = 0.05         # lowest pointer/device speed ratio at typical speeds (like the CTM clamp)
+CURVE_DEFAULT = {"type": "parametric", "gain": 1.0, "accel": 0.05, "exponent": 2.0, "max_speed": 40.0}
+
+def validate_curve(curve: Any) -> Dict[str, Any]:
+    """Return a normalized copy of a curve definition; raise ValueError if it is unusable."""
+    out = _validate_curve_shape(curve)
+    # A curve that is (near) zero at typical speeds would freeze the pointer
+    step, xs, ys = _curve_xy(out)
+    top = max(CURVE_FLAT_RANGE, step)
+    if any(y < CURVE_MIN_GAIN * x * (1 - 1e-9) for x, y in zip(xs, ys) if 0 < x <= top):
+        raise ValueError(f"pointer speed must be at least {CURVE_MIN_GAIN:g}× device speed "
+                         f"up to {CURVE_FLAT_RANGE:g} units/ms")
+    return out
+
+def _validate_curve_shape(curve: Any) -> Dict[str, Any]:
+    if not isinstance(curve, dict):
+        raise ValueError("curve must be an object")
+    kind = curve.get("type")
+    if kind == "parametric":
+        try:
+            out = {"type": "parametric",
+                   "gain": float(curve.get("gain", CURVE_DEFAULT["gain"])),
+                   "accel": float(curve.get("accel", CURVE_DEFAULT["accel"])),
+                   "exponent": float(curve.get("exponent", CURVE_DEFAULT["exponent"])),
+                   "max_speed": float(curve.get("max_speed", CURVE_DEFAULT["max_speed"]))}
+        except (TypeError, ValueError):
+            raise ValueError("parametric curve values must be numbers")
+        if not all(math.isfinite(v) for v in out.values() if isinstance(v, float)):
+            raise ValueError("parametric curve values must be finite")
+        if out["gain"] < 0 or out["accel"] < 0:
+            raise ValueError("gain and accel must not be negative")
+        if not 0.5 <= out["exponent"] <= 4.0:
+            raise ValueError("exponent must be between 0.5 and 4")
+        if not 0 < out["max_speed"] <= CURVE_MAX_VALUE:
+            raise ValueError("max_speed must be positive")
+        return out
+    if kind == "points":
+        raw = curve.get("points")
+        try:
+            pts = [(float(x), float(y)) for x, y in raw]
+        except (TypeError, ValueError):
+            raise ValueError("points must be a list of [x, y] pairs")
+        if not 2 <= len(pts) <= CURVE_NPOINTS:
+            raise ValueError(f"a point curve needs 2 to {CURVE_NPOINTS} points")
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        if any(not (0.0 <= v <= CURVE_MAX_VALUE) for v in xs + ys):  # also rejects NaN
+            raise ValueError(f"point coordinates must be between 0 and {CURVE_MAX_VALUE:g}")
+        if any(b <= a for a, b in zip(xs, xs[1:])):
+            raise ValueError("point x values must be strictly increasing")
+        return {"type": "points", "points": [[x, y] for x, y in pts]}
+    raise ValueError("curve type must be 'parametric' or 'points'")
+
+def _curve_xy(curve: Dict[str, Any]) -> Tuple[float, Any, Any]:
+    """(step, xs, ys) sampled at CURVE_NPOINTS evenly spaced device speeds from 0."""
+    if curve["type"] == "parametric":
+        top = curve["max_speed"]
+    else:
+        top = curve["points"][-1][0]
+    step = top / (CURVE_NPOINTS - 1)
+
+    if np is not None:
+        xs = np.arange(CURVE_NPOINTS, dtype=np.float64) * step
+        if curve["type"] == "parametric":
+            ys = curve["gain"] * xs + curve["accel"] * np.power(xs, curve["exponent"])
+        else:
+            pts = np.asarray(curve["points"], dtype=np.float64)
+            ys = np.interp(xs, pts[:, 0], pts[:, 1])  # flat to the left of the first point
+        return step, xs, np.clip(ys, 0.0, CURVE_MAX_VALUE)
+
+    xs = [i * step for i in range(CURVE_NPOINTS)]
+    if curve["type"] == "parametric":
+        ys = [curve["gain"] * x + curve["accel"] * x ** curve["exponent"] for x in xs]
+    else:
+        pts = curve["points"]
+        ys, j = [], 0
+        for x in xs:
+            while j < len(pts) - 2 and x > pts[j + 1][0]:
+                j += 1
+            (x0, y0), (x1, y1) = pts[j], pts[j + 1]
+            ys.append(y0 if x <= x0 else y0 + (y1 - y0) * min(1.0, (x - x0) / (x1 - x0)))
+    return step, xs, [min(max(y, 0.0), CURVE_MAX_VALUE) for y in ys]
+
+@functools.lru_cache(maxsize=64)
+def _sample_curve_key(key: str) -> Tuple[float, Tuple[float, ...], float]:
+    curve = json.loads(key)
+    step, xs, ys = _curve_xy(curve)
+
+    # Least-squares gain through the origin over typical speeds (flat-profile fallback)
+    if np is not None:
+        mask = xs <= max(CURVE_FLAT_RANGE, step)
+        den = float(np.dot(xs[mask], xs[mask]))
+        gain = float(np.dot(xs[mask], ys[mask])) / den if den else 1.0
+        points = tuple(float(v) for v in np.round(ys, 4))
+    else:
+        pairs = [(x, y) for x, y in zip(xs, ys) if x <= max(CURVE_FLAT_RANGE, step)]
+        den = sum(x * x for x, _ in pairs)
+        gain = sum(x * y for x, y in pairs) / den if den else 1.0
+        points = tuple(round(y, 4) for y in ys)
+    return step, points, gain
+
+def sample_curve(curve: Dict[str, Any]) -> Tuple[float, Tuple[float, ...], float]:
+    """
+    Sample a curve into libinput custom-accel data: (motion step, motion points,
+    flat gain for the CTM fallback). Results are cached per curve definition.
+    """
+    norm = validate_curve(curve)
+    return _sample_curve_key(json.dumps(norm, sort_keys=True))
+
+def active_curve(cfg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The profile's curve if it is enabled and valid, else None."""
+    if not cfg.get("curve_enabled") or not cfg.get("curve"):
+        return None
+    try:
+        return validate_curve(cfg["curve"])
+    except ValueError as e:
+        debug(f"Ignoring invalid acceleration curve: {e}")
+        return None
+
+
+# --------------------------
+# Device discovery (xinput)
+# --------------------------
+
+def run_cmd(cmd: List[str]) -> str:
+    """Execute a command and return stdout as text; log errors to debug()."""
+    try:
+        debug(f"Running: {' '.join(cmd)}")
+        out = subprocess.check_output(cmd, text=True, stderr=subprocess.STDOUT)
+        return out.strip()
+    except subprocess.CalledProcessError as e:
+        debug(f"Error running {' '.join(cmd)}:\n{e.output.strip()}")
+        return ""
+    except OSError as e:
+        debug(f"Error running {' '.join(cmd)}: {e}")
+        return ""
+
+def _is_virtual_pointer_line(raw: str) -> bool:
+    """Return True for Virtual/Master/XTEST pointers we should hide/ignore."""
+    low = raw.lower()
+    if "master pointer" in low:
+        return True
+    if "virtual core" in low:
+        return True
+    if "xtest" in low:
+        return True
+    return False
+
+def _parse_id_from_short_line(line: str) -> Optional[str]:
+    """Parse 'id=<digits>' from one line of `xinput list --short` output."""
+    try:
+        left = line.split("id=", 1)[1]
+        digits = ""
+        for ch in left:
+            if ch.isdigit():
+                digits += ch
+            else:
+                break
+        return digits or None
+    except Exception:
+        return None
+
+def parse_device_list(out: str) -> List[dict]:
+    """Extract slave pointers as [{'name':..., 'id':...}] from `xinput list --short`."""
+    devices: List[dict] = []
+    seen = set()
+    for raw in out.splitlines():
+        line = raw.strip()
+        if "pointer" not in line:
+            continue
+        if _is_virtual_pointer_line(line):
+            continue
+
+        # Strip leading decoration chars, then extract name + id
+        clean = line
+        while clean and (clean[0] in "⎡⎣⎜⎟↳⎜⎢⎥" or clean[0].isspace()):
+            clean = clean[1:]
+        name = clean.split("id=")[0].rstrip()
+        dev_id = _parse_id_from_short_line(clean)
+
+        if not name or not dev_id:
+            continue
+
+        key = (name, dev_id)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        devices.append({"name": name, "id": dev_id})
+    return devices
+
+def probe_capabilities(device_id: str) -> List[str]:
+    """Return which CAPABILITY_PROPS the device exposes (one `xinput list-props` call)."""
+    out = run_cmd(["xinput", "list-props", device_id])
+    return [prop for prop in CAPABILITY_PROPS if prop in out]
+
+def scan_devices(known_caps: Optional[Dict[Tuple[str, str], List[str]]] = None) -> Optional[List[dict]]:
+    """
+    Full device scan with capabilities; None when xinput gives no answer.
+    Devices already in known_caps (same name+id) are not probed again.
+    """
+    out = run_cmd(["xinput", "list", "--short"])
+    if not out:
+        return None
+    devices = parse_device_list(out)
+    known_caps = known_caps or {}
+    for dev in devices:
+        key = (dev["name"], dev["id"])
+        dev["caps"] = known_caps[key] if key in known_caps else probe_capabilities(dev["id"])
+    return devices
+
+def load_device_cache() -> List[dict]:
+    """Read the last successful device snapshot; empty list if missing or unreadable."""
+    try:
+        if DEVICE_CACHE_PATH.exists():
+            raw = json.loads(DEVICE_CACHE_PATH.read_text(encoding="utf-8"))
+            out = []
+            for d in raw.get("devices", []):
+                out.append({"name": str(d["name"]), "id": str(d["id"]),
+                            "caps": [str(c) for c in d.get("caps", [])]})
+            return out
+    except Exception as e:
+        debug(f"Error reading device cache: {e}")
+    return []
+
+def save_device_cache(devices: List[dict]) -> None:
+    """Persist a device snapshot so the next startup can paint it immediately."""
+    try:
+        DEVICE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        DEVICE_CACHE_PATH.write_text(json.dumps({"devices": devices}, indent=2, ensure_ascii=False),
+                                     encoding="utf-8")
+    except Exception as e:
+        debug(f"Error saving device cache: {e}")
+
+
+class DeviceScanner(QThread):
+    """Runs scan_devices() off the GUI thread and reports each result."""
+    scanned = pyqtSignal(object)  # List[dict], or None when xinput failed
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.known_caps: Dict[Tuple[str, str], List[str]] = {}
+
+    def run(self) -> None:
+        self.scanned.emit(scan_devices(self.known_caps))
+
 
 # --------------------------
 # i18n loader (keeps refs)
@@ -185,13 +805,18 @@ def install_translators(app: QApplication, forced_locale: Optional[str] = None,
 # --------------------------
 
 class WhitelistDialog(QDialog):
-    """Dialog to edit the visible-devices whitelist (entries are (name, id))."""
-    def __init__(self, parent: QWidget, devices: List[dict], whitelist: Set[Tuple[str, str]]):
+    """
+    Dialog to edit the visible-devices whitelist (entries are (name, id)).
+    Whitelisted devices that are not connected are listed too, with their age,
+    and can be pruned by last-seen date.
+    """
+    def __init__(self, parent: QWidget, devices: List[dict], whitelist: List[dict]):
         super().__init__(parent)
         self.setWindowTitle(self.tr("Edit device whitelist"))
         self.setMinimumWidth(520)
         self._devices = devices
         self._initial = whitelist
+        now = int(time.time())
 
         layout = QVBoxLayout(self)
 
@@ -200,204 +825,325 @@ class WhitelistDialog(QDialog):
         layout.addWidget(info)
 
         # Checkable list with all current devices; pre-check those in whitelist
+        wl_keys = {(str(e.get("name")), str(e.get("id"))): e for e in whitelist if isinstance(e, dict)}
         self.listw = QListWidget()
         self.listw.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
         for dev in devices:
             name, did = dev["name"], dev["id"]
-            text = f"{name}  (id {did})"
-            item = QListWidgetItem(text)
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            item.setCheckState(Qt.CheckState.Checked if (name, did) in whitelist else Qt.CheckState.Unchecked)
-            # Store device data
-            item.setData(Qt.ItemDataRole.UserRole, did)
-            item.setData(Qt.ItemDataRole.UserRole + 1, name)
-            self.listw.addItem(item)
+            self._add_item(f"{name}  (id {did})", name, did, (name, did) in wl_keys, now)
+
+        # Whitelisted but not connected: keep them, show how long they have been gone
+        connected = {(d["name"], d["id"]) for d in devices}
+        for (name, did), entry in wl_keys.items():
+            if (name, did) in connected:
+                continue
+            last_seen = _last_seen(entry, now)
+            days = max(0, now - last_seen) // (24 * 3600)
+            text = self.tr("{name}  (id {id}) — not connected, last seen {days} days ago").format(
+                name=name, id=did, days=days)
+            self._add_item(text, name, did, True, last_seen)
         layout.addWidget(self.listw)
 
+        # Prune row: uncheck entries not seen in N days
+        prune_row = QHBoxLayout()
+        prune_row.addWidget(QLabel(self.tr("Uncheck devices not seen in")))
+        self.prune_days = QSpinBox()
+        self.prune_days.setRange(1, 3650)
+        self.prune_days.setValue(30)
+        self.prune_days.setSuffix(self.tr(" days"))
+        prune_row.addWidget(self.prune_days)
+        btn_prune = QPushButton(self.tr("Prune"))
+        btn_prune.clicked.connect(self.prune_unseen)
+        prune_row.addWidget(btn_prune)
+        prune_row.addStretch(1)
+        layout.addLayout(prune_row)
+
         # OK/Cancel
         bb = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         bb.accepted.connect(self.accept)
         bb.rejected.connect(self.reject)
         layout.addWidget(bb)
 
+    def _add_item(self, text: str, name: str, did: str, checked: bool, last_seen: int) -> None:
+        """Append a checkable row storing id, name and last-seen time in data roles."""
+        item = QListWidgetItem(text)
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        item.setCheckState(Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+        # Store device data
+        item.setData(Qt.ItemDataRole.UserRole, did)
+        item.setData(Qt.ItemDataRole.UserRole + 1, name)
+        item.setData(Qt.ItemDataRole.UserRole + 2, last_seen)
+        self.listw.addItem(item)
+
+    def prune_unseen(self) -> None:
+        """Uncheck every entry whose device has not been seen for the chosen number of days."""
+        cutoff = int(time.time()) - self.prune_days.value() * 24 * 3600
+        for i in range(self.listw.count()):
+            item = self.listw.item(i)
+            if int(item.data(Qt.ItemDataRole.UserRole + 2)) < cutoff:
+                item.setCheckState(Qt.CheckState.Unchecked)
+
     def result_whitelist(self) -> List[dict]:
-        """Return the whitelist as [{'name':..., 'id':...}, ...]."""
+        """Return the whitelist as [{'name':..., 'id':..., 'last_seen':...}, ...]."""
         res = []
         for i in range(self.listw.count()):
             item = self.listw.item(i)
             if item.checkState() == Qt.CheckState.Checked:
                 res.append({"name": item.data(Qt.ItemDataRole.UserRole + 1),
-                            "id":   item.data(Qt.ItemDataRole.UserRole)})
+                            "id":   item.data(Qt.ItemDataRole.UserRole),
+                            "last_seen": int(item.data(Qt.ItemDataRole.UserRole + 2))})
         return res
 
 
 # --------------------------
-# Main window
+# Acceleration curve dialog
 # --------------------------
 
-class LibinputGUI(QWidget):
-    """Main window for xinput-plus."""
-    def __init__(self) -> None:
-        super().__init__()
-        self.setWindowTitle("xinput-plus")
-        self.setMinimumWidth(800)
-
-        # Window icon: theme → installed paths → dev fallback
-        self.setWindowIcon(get_app_icon())
-
-        # State
-        self.all_devices: List[dict] = []          # all slave pointers detected
-        self.visible_devices: List[dict] = []      # filtered by whitelist mode
-        self.selected_device_name: str = ""
-        self.selected_device_id: Optional[str] = None
+class CurvePreview(QWidget):
+    """Plot of a sampled curve (pointer speed vs. device speed) with y = x for reference."""
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setMinimumSize(320, 200)
+        self._step = 0.0
+        self._points: Tuple[float, ...] = ()
+
+    def set_samples(self, step: float, points: Tuple[float, ...]) -> None:
+        self._step, self._points = step, points
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        p = QPainter(self)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = self.rect().adjusted(8, 8, -8, -8)
+        p.drawRect(rect)
+        if len(self._points) < 2:
+            return
 
-        # Config
-        self.config = self.load_config()
+        top_x = self._step * (len(self._points) - 1)
+        top_y = max(max(self._points), top_x) or 1.0
+        sx, sy = rect.width() / (top_x or 1.0), rect.height() / top_y
 
-        # UI
-        self.build_ui()
-        self.load_devices()
+        def to_px(x: float, y: float) -> QPointF:
+            return QPointF(rect.left() + x * sx, rect.bottom() - y * sy)
 
-        # Auto-apply after a short delay to avoid session-start races
-        QTimer.singleShot(1000, self.apply_all_configs)
+        ref = QPen(self.palette().mid().color())
+        ref.setStyle(Qt.PenStyle.DashLine)
+        p.setPen(ref)
+        p.drawLine(to_px(0, 0), to_px(top_x, top_x))
 
-    # --------------------------
-    # Persistence
-    # --------------------------
-    def load_config(self) -> Dict[str, Any]:
-        """Load config JSON and migrate legacy shape if needed."""
-        try:
-            if CONFIG_PATH.exists():
-                raw = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-                return _migrate_old_config(raw)
-        except Exception as e:
-            debug(f"Error reading config: {e}")
-        return {"by_name": {}, "by_id": {}, "_whitelist": [], "_show_only_whitelist": False}
+        pen = QPen(self.palette().highlight().color())
+        pen.setWidth(2)
+        p.setPen(pen)
+        p.drawPolyline(QPolygonF([to_px(i * self._step, y) for i, y in enumerate(self._points)]))
 
-    def save_config(self) -> None:
-        """Persist current config JSON to disk."""
-        try:
-            CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-            CONFIG_PATH.write_text(json.dumps(self.config, indent=2, ensure_ascii=False), encoding="utf-8")
-        except Exception as e:
-            debug(f"Error saving config: {e}")
 
-    # --------------------------
-    # UI
-    # --------------------------
-    def build_ui(self) -> None:
-        """Construct the main layout and bind signals."""
-        layout = QHBoxLayout(self)
-
-        # Device list (left column)
-        self.device_list = QListWidget()
-        self.device_list.itemSelectionChanged.connect(self.on_device_selected)
-        layout.addWidget(self.device_list, 2)
-
-        # Right panel with controls
-        right = QVBoxLayout()
+class CurveDialog(QDialog):
+    """
+    Editor for a custom acceleration curve (parametric or points). Every valid
+    edit is sampled (cached) and emitted right away so it can be applied live.
+    """
+    curve_changed = pyqtSignal(object)  # normalized curve dict, or None when disabled
 
-        self.label_device = QLabel(self.tr("Select a device"))
-        right.addWidget(self.label_device)
+    def __init__(self, parent: QWidget, curve: Optional[Dict[str, Any]], enabled: bool):
+        super().__init__(parent)
+        self.setWindowTitle(self.tr("Acceleration curve"))
+        self.setMinimumWidth(480)
+        curve = curve or dict(CURVE_DEFAULT)
+        self._curve: Optional[Dict[str, Any]] = None
+        self._emitted_enabled = enabled
 
-        self.extended_speed_cb = QCheckBox(self.tr("Extra speed (for slow devices)"))
-        self.extended_speed_cb.toggled.connect(self.on_extended_toggled)
-        right.addWidget(self.extended_speed_cb)
+        layout = QVBoxLayout(self)
 
-        self.profile_by_id_cb = QCheckBox(self.tr("Save by ID (specific profile)"))
-        right.addWidget(self.profile_by_id_cb)
+        self.enable_cb = QCheckBox(self.tr("Use custom acceleration curve"))
+        self.enable_cb.setChecked(enabled)
+        layout.addWidget(self.enable_cb)
+
+        self.type_combo = QComboBox()
+        self.type_combo.addItem(self.tr("Parametric: y = gain·x + accel·x^exponent"), "parametric")
+        self.type_combo.addItem(self.tr("Points (x y per line)"), "points")
+        layout.addWidget(self.type_combo)
+
+        # Parametric editor
+        self.stack = QStackedWidget()
+        param = QWidget()
+        form = QFormLayout(param)
+        self.spin_gain = self._spin(CURVE_MIN_GAIN, 10.0, 0.05, 3, curve.get("gain", CURVE_DEFAULT["gain"]))
+        self.spin_accel = self._spin(0.0, 5.0, 0.005, 3, curve.get("accel", CURVE_DEFAULT["accel"]))
+        self.spin_exponent = self._spin(0.5, 4.0, 0.05, 2, curve.get("exponent", CURVE_DEFAULT["exponent"]))
+        self.spin_max = self._spin(1.0, 200.0, 1.0, 1, curve.get("max_speed", CURVE_DEFAULT["max_speed"]))
+        form.addRow(self.tr("Gain"), self.spin_gain)
+        form.addRow(self.tr("Acceleration"), self.spin_accel)
+        form.addRow(self.tr("Exponent"), self.spin_exponent)
+        form.addRow(self.tr("Max device speed"), self.spin_max)
+        self.stack.addWidget(param)
+
+        # Points editor
+        self.points_edit = QPlainTextEdit()
+        pts = curve.get("points") or [[0, 0], [10, 10], [40, 80]]
+        self.points_edit.setPlainText("\n".join(f"{x:g} {y:g}" for x, y in pts))
+        self.points_edit.textChanged.connect(self._on_edited)
+        self.stack.addWidget(self.points_edit)
+        layout.addWidget(self.stack)
+
+        self.preview = CurvePreview()
+        layout.addWidget(self.preview)
+        self.label_error = QLabel("")
+        layout.addWidget(self.label_error)
 
-        # Natural scrolling (reverse) toggle
-        self.natural_scroll_cb = QCheckBox(self.tr("Natural scrolling (reverse)"))
-        self.natural_scroll_cb.toggled.connect(self.on_natural_toggled)
-        right.addWidget(self.natural_scroll_cb)
+        bb = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        bb.accepted.connect(self.accept)
+        bb.rejected.connect(self.reject)
+        self.btn_ok = bb.button(QDialogButtonBox.StandardButton.Ok)
+        layout.addWidget(bb)
 
-        # Tap-to-click (enable left-click on touchpads)
-        self.tapping_cb = QCheckBox(self.tr("Tap to click (enable left-click)"))
-        self.tapping_cb.setChecked(True)  # default ON
-        self.tapping_cb.toggled.connect(self.on_tapping_toggled)
-        right.addWidget(self.tapping_cb)
+        self.type_combo.setCurrentIndex(1 if curve.get("type") == "points" else 0)
+        self.stack.setCurrentIndex(self.type_combo.currentIndex())
+        self.type_combo.currentIndexChanged.connect(self._on_type_changed)
+        self.enable_cb.toggled.connect(self._on_edited)
+        self._on_edited()
+
+    def _spin(self, lo: float, hi: float, step: float, decimals: int, value: float) -> QDoubleSpinBox:
+        sb = QDoubleSpinBox()
+        sb.setRange(lo, hi)
+        sb.setSingleStep(step)
+        sb.setDecimals(decimals)
+        sb.setValue(float(value))
+        sb.valueChanged.connect(self._on_edited)
+        return sb
+
+    def _on_type_changed(self, index: int) -> None:
+        self.stack.setCurrentIndex(index)
+        self._on_edited()
+
+    def _read_curve(self) -> Dict[str, Any]:
+        """Build a curve from the widgets; raise ValueError if it doesn't validate."""
+        if self.type_combo.currentData() == "parametric":
+            raw = {"type": "parametric", "gain": self.spin_gain.value(), "accel": self.spin_accel.value(),
+                   "exponent": self.spin_exponent.value(), "max_speed": self.spin_max.value()}
+        else:
+            pts = []
+            for line in self.points_edit.toPlainText().splitlines():
+                fields = line.replace(",", " ").split()
+                if not fields:
+                    continue
+                if len(fields) != 2:
+                    raise ValueError(self.tr("each line needs two numbers: x y"))
+                pts.append(fields)
+            raw = {"type": "points", "points": pts}
+        return validate_curve(raw)
+
+    def _on_edited(self, *_args) -> None:
+        """Validate, sample and preview the current edit; emit it when usable."""
+        try:
+            curve = self._read_curve()
+            step, points, gain = sample_curve(curve)
+        except ValueError as e:
+            self.label_error.setText(self.tr("Invalid curve: {err}").format(err=e))
+            self.btn_ok.setEnabled(False)
+            return
+        self._curve = curve
+        self.preview.set_samples(step, points)
+        self.label_error.setText(self.tr("Flat-profile approximation: ×{gain:.2f}").format(gain=gain))
+        self.btn_ok.setEnabled(True)
+        if self.enable_cb.isChecked():
+            self.curve_changed.emit(curve)
+        elif self._emitted_enabled:
+            self.curve_changed.emit(None)  # only once, when switching the curve off
+        self._emitted_enabled = self.enable_cb.isChecked()
 
-        self.label_speed = QLabel(self.tr("Speed: 0.00"))
-        right.addWidget(self.label_speed)
+    def result_curve(self) -> Optional[Dict[str, Any]]:
+        """The last valid curve (kept even when disabled, so it can be re-enabled later)."""
+        return self._curve
 
-        self.slider_speed = QSlider(Qt.Orientation.Horizontal)
-        self.slider_speed.setMinimum(-100)
-        self.slider_speed.setMaximum(100)
-        self.slider_speed.setValue(0)
-        self.slider_speed.setSingleStep(1)
-        self.slider_speed.valueChanged.connect(self.on_speed_changed)
-        right.addWidget(self.slider_speed)
+    def result_enabled(self) -> bool:
+        return self.enable_cb.isChecked()
 
-        # Buttons row
-        # ----- Row 1: main actions -----
-        row1 = QHBoxLayout()
 
-        self.btn_refresh = QPushButton(self.tr("🔄 Refresh"))
-        self.btn_refresh.clicked.connect(self.load_devices)
-        row1.addWidget(self.btn_refresh)
+# --------------------------
+# Device model & apply engine
+# --------------------------
 
-        self.btn_reapply = QPushButton(self.tr("⚙️ Re-apply all"))
-        self.btn_reapply.clicked.connect(self.apply_all_configs)
-        row1.addWidget(self.btn_reapply)
+class DeviceManager(QObject):
+    """
+    Config, device snapshot and xinput apply logic without any widgets.
+    Lives for the whole session; windows attach to it and may come and go.
+    """
+    devices_changed = pyqtSignal()   # all_devices or devices_stale changed
+    scan_failed = pyqtSignal()       # a background scan got no answer from xinput
+    profiles_changed = pyqtSignal()  # config edited outside the window (e.g. tray presets)
 
-        self.show_only_whitelist_cb = QCheckBox(self.tr("Show only whitelist"))
-        self.show_only_whitelist_cb.setChecked(bool(self.config.get("_show_only_whitelist", False)))
-        self.show_only_whitelist_cb.toggled.connect(self.on_toggle_show_only_whitelist)
-        row1.addWidget(self.show_only_whitelist_cb)
+    def __init__(self) -> None:
+        super().__init__()
 
-        row1.addStretch(1)
+        # State
+        self.all_devices: List[dict] = []          # all slave pointers detected
+        self.devices_stale: bool = False           # True while showing the cached snapshot
+        self._pending_apply: bool = False          # apply_all_configs deferred until revalidation
+        self._gc_time: Optional[int] = None        # when this session's gc ran; newer entries are kept
+        self._scanner: Optional[DeviceScanner] = None
+        self._watch_timer: Optional[QTimer] = None
+        self.scroll_pipelines: Dict[str, ScrollPipeline] = {}  # X id → running pipeline
+        self._scroll_failed: Set[str] = set()                   # X ids not retried until profiles change
 
-        # ----- Row 2: whitelist editor and about -----
-        row2 = QHBoxLayout()
+        # Config
+        self.config = self.load_config()
 
-        self.btn_edit_whitelist = QPushButton(self.tr("✏️ Edit whitelist"))
-        self.btn_edit_whitelist.clicked.connect(self.open_whitelist_dialog)
-        row2.addWidget(self.btn_edit_whitelist)
+    def start(self) -> None:
+        """Adopt the cached snapshot, revalidate it in the background, then auto-apply."""
+        self.set_devices(load_device_cache(), stale=True)
+        self.revalidate_devices()
 
-        self.btn_about = QPushButton(self.tr("🛈 About"))
-        self.btn_about.clicked.connect(self.show_about)
-        row2.addWidget(self.btn_about)
+        # Auto-apply after a short delay to avoid session-start races
+        QTimer.singleShot(1000, self.apply_all_configs)
 
-        row2.addStretch(1)
+    def shutdown(self) -> None:
+        """Finish a running scan, release grabbed devices and remove virtual clones (call before quitting)."""
+        if self._watch_timer is not None:
+            self._watch_timer.stop()
+        if self._scanner is not None:
+            # The thread must not outlive its parent; a slow xinput can keep it busy for a while
+            self._scanner.scanned.disconnect(self.on_devices_scanned)
+            self._scanner.wait()
+            self._scanner = None
+        for pipe in self.scroll_pipelines.values():
+            pipe.stop()
+        self.scroll_pipelines.clear()
+
+    def start_watching(self, interval_ms: int) -> None:
+        """Re-scan periodically so replugged devices get their profile back."""
+        if self._watch_timer is None:
+            self._watch_timer = QTimer(self)
+            self._watch_timer.timeout.connect(self.revalidate_devices)
+        self._watch_timer.start(interval_ms)
 
-        # Add both rows to the right panel
-        right.addLayout(row1)
-        right.addLayout(row2)
-        
-        right.addStretch(1)
+    # --------------------------
+    # Persistence
+    # --------------------------
+    def load_config(self) -> Dict[str, Any]:
+        """Load config JSON and migrate legacy shape if needed."""
+        return read_config()
 
-        layout.addLayout(right, 3)
+    def save_config(self) -> None:
+        """Persist current config JSON to disk."""
+        write_config(self.config)
 
     # --------------------------
-    # Device discovery & list
+    # Device snapshot
     # --------------------------
-    def _is_virtual_pointer_line(self, raw: str) -> bool:
-        """Return True for Virtual/Master/XTEST pointers we should hide/ignore."""
-        low = raw.lower()
-        if "master pointer" in low:
-            return True
-        if "virtual core" in low:
-            return True
-        if "xtest" in low:
-            return True
-        return False
-
-    def _parse_id_from_short_line(self, line: str) -> Optional[str]:
-        """Parse 'id=<digits>' from one line of `xinput list --short` output."""
-        try:
-            left = line.split("id=", 1)[1]
-            digits = ""
-            for ch in left:
-                if ch.isdigit():
-                    digits += ch
-                else:
-                    break
-            return digits or None
-        except Exception:
-            return None
-
-    def _whitelist_set(self) -> Set[Tuple[str, str]]:
+    def store_id_profile(self, name: str, dev_id: str, values: Dict[str, Any]) -> None:
+        """Create/update the by_id profile for a device and keep by_id within its limit."""
+        by_id = self.config.setdefault("by_id", {})
+        entry = id_profile(self.config, name, dev_id)
+        if entry is None:
+            entry = by_id[dev_id] = {}  # new, or the id now belongs to another device
+        entry.update(values)
+        entry["name"] = name
+        entry["last_seen"] = int(time.time())
+        for line in evict_by_id(self.config, retention_limits(self.config)["max_by_id"],
+                                keep_since=self._gc_time, keep=dev_id):
+            debug(f"gc: {line}")
+
+    def whitelist_set(self) -> Set[Tuple[str, str]]:
         """Return whitelist as a set of (name, id) tuples for quick filtering."""
         wl = self.config.get("_whitelist", [])
         out: Set[Tuple[str, str]] = set()
@@ -409,99 +1155,161 @@ class LibinputGUI(QWidget):
                     continue
         return out
 
-    def _compute_visible(self) -> None:
-        """Compute visible_devices by applying the whitelist (if enabled and non-empty)."""
+    def visible_devices(self) -> List[dict]:
+        """Devices after applying the whitelist (if enabled and non-empty)."""
         show_only = bool(self.config.get("_show_only_whitelist", False))
-        wl = self._whitelist_set()
+        wl = self.whitelist_set()
 
+        # Our scroll pipelines' virtual clones follow the original device's profile
+        devices = [d for d in self.all_devices if not d["name"].endswith(SCROLL_DEVICE_SUFFIX)]
         if show_only and wl:
-            self.visible_devices = [d for d in self.all_devices if (d["name"], d["id"]) in wl]
-        else:
-            self.visible_devices = list(self.all_devices)
-
-    def load_devices(self) -> None:
-        """Scan all slave pointers via xinput, then repopulate the visible list."""
-        self.all_devices = []
-        self.device_list.clear()
-
-        out = self.run_cmd(["xinput", "list", "--short"])
-        if not out:
-            QMessageBox.warning(
-                self,
-                "xinput",
-                self.tr("Could not obtain the device list.\nIs xinput available?")
-            )
+            return [d for d in devices if (d["name"], d["id"]) in wl]
+        return devices
+
+    def set_devices(self, devices: List[dict], stale: bool) -> None:
+        """Adopt a device snapshot (cached or fresh) and notify listeners."""
+        self.all_devices = devices
+        self.devices_stale = stale
+        self.devices_changed.emit()
+
+    def _known_caps(self) -> Dict[Tuple[str, str], List[str]]:
+        """Capabilities from the current fresh snapshot, reusable by the next scan."""
+        if self.devices_stale:
+            return {}
+        return {(d["name"], d["id"]): list(d["caps"]) for d in self.all_devices if "caps" in d}
+
+    def load_devices(self) -> bool:
+        """Scan all slave pointers via xinput synchronously; False if xinput gave no answer."""
+        devices = scan_devices(self._known_caps())
+        if devices is None:
+            return False
+        self.on_devices_scanned(devices)
+        return True
+
+    def revalidate_devices(self) -> None:
+        """Re-scan devices in a background thread; the result lands in on_devices_scanned."""
+        if self._scanner is not None and self._scanner.isRunning():
+            return
+        if self._scanner is None:
+            self._scanner = DeviceScanner(self)
+            self._scanner.scanned.connect(self.on_devices_scanned)
+        self._scanner.known_caps = self._known_caps()
+        self._scanner.start()
+
+    def on_devices_scanned(self, devices: Optional[List[dict]]) -> None:
+        """Adopt a scan result; keep the current list if xinput failed."""
+        if devices is None:
+            self.scan_failed.emit()
             return
 
-        seen = set()
-        for raw in out.splitlines():
-            line = raw.strip()
-            if "pointer" not in line:
-                continue
-            if self._is_virtual_pointer_line(line):
-                continue
+        # Keep id-keyed entries fresh; the first fresh scan also enforces retention
+        was_stale = self.devices_stale
+        changed = mark_seen(self.config, devices)
+        if was_stale:
+            self._gc_time = int(time.time())
+            for line in gc_config(self.config, now=self._gc_time):
+                debug(f"gc: {line}")
+                changed = True
+        if changed:
+            self.save_config()
 
-            # Strip leading decoration chars, then extract name + id
-            clean = line
-            while clean and (clean[0] in "⎡⎣⎜⎟↳⎜⎢⎥" or clean[0].isspace()):
-                clean = clean[1:]
-            name = clean.split("id=")[0].rstrip()
-            dev_id = self._parse_id_from_short_line(clean)
+        old_ids = {d["id"] for d in self.all_devices}
+        if not was_stale and devices == self.all_devices:
+            return  # nothing plugged or unplugged since the last scan
 
-            if not name or not dev_id:
-                continue
+        save_device_cache(devices)
+        self.set_devices(devices, stale=False)
 
-            key = (name, dev_id)
-            if key in seen:
-                continue
-            seen.add(key)
+        if self._pending_apply:
+            self._pending_apply = False
+            self.apply_all_configs()
+        elif not was_stale:
+            # Hotplug: give newly appeared devices their stored profile
+            self.apply_configs([d for d in devices if d["id"] not in old_ids])
+        self.sync_scroll_pipelines()
 
-            self.all_devices.append({"name": name, "id": dev_id})
+    def sync_scroll_pipelines(self, retry: bool = False) -> None:
+        """Start, retune or stop scroll pipelines so they match the profiles' scroll_multiplier."""
+        if not scroll_available() or self.devices_stale:
+            return
+        if retry:
+            self._scroll_failed.clear()
 
-        # Apply whitelist logic to compute visible_devices
-        self._compute_visible()
+        wanted: Dict[str, float] = {}
+        for dev in self.all_devices:
+            if dev["name"].endswith(SCROLL_DEVICE_SUFFIX):
+                continue
+            cfg = self.get_settings_for(dev["name"], dev["id"]) or {}
+            mult = scroll_multiplier(cfg)
+            if mult != 1.0:
+                wanted[dev["id"]] = mult
+
+        for did in list(self.scroll_pipelines):
+            pipe = self.scroll_pipelines[did]
+            if did not in wanted or not pipe.is_running():
+                pipe.stop()
+                del self.scroll_pipelines[did]
+
+        started = False
+        for did, mult in wanted.items():
+            if did in self.scroll_pipelines:
+                self.scroll_pipelines[did].set_multiplier(mult)
+                continue
+            if did in self._scroll_failed:
+                continue
+            node = device_node(did)
+            pipe = ScrollPipeline(node, mult) if node else None
+            if pipe is not None and pipe.start():
+                self.scroll_pipelines[did] = pipe
+                started = True
+            else:
+                self._scroll_failed.add(did)
 
-        # Paint the list with "Name  (id N)" and store id/name in item data roles
-        for dev in self.visible_devices:
-            name, did = dev["name"], dev["id"]
-            item_text = f"{name}  (id {did})"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, did)
-            item.setData(Qt.ItemDataRole.UserRole + 1, name)
-            self.device_list.addItem(item)
+        if started:
+            # The virtual clone shows up as a new X device; pick it up to give it the profile
+            QTimer.singleShot(500, self.revalidate_devices)
 
-        # Default selection for convenience
-        if self.device_list.count() > 0:
-            self.device_list.setCurrentRow(0)
+    def with_scroll_clone(self, device_id: str) -> List[str]:
+        """device_id plus the id of its scroll clone, which carries the motion while the original is grabbed."""
+        ids = [device_id]
+        if device_id in self.scroll_pipelines:
+            name = next((d["name"] for d in self.all_devices if d["id"] == device_id), None)
+            ids += [d["id"] for d in self.all_devices
+                    if d["name"].endswith(SCROLL_DEVICE_SUFFIX) and profile_name(d["name"]) == name]
+        return ids
 
     # --------------------------
     # Config lookup & application
     # --------------------------
     def device_has_prop(self, device_id: str, prop_name: str) -> bool:
-        """Return True if the given property appears in `xinput list-props <id>` output."""
+        """Return True if the device exposes the property (scanned caps, else `xinput list-props`)."""
+        if not self.devices_stale and prop_name in CAPABILITY_PROPS:
+            for dev in self.all_devices:
+                if dev["id"] == device_id and "caps" in dev:
+                    return prop_name in dev["caps"]
         out = self.run_cmd(["xinput", "list-props", device_id])
         return (prop_name in out) if out else False
 
     def run_cmd(self, cmd: List[str]) -> str:
         """Execute a command and return stdout as text; log errors to debug()."""
-        try:
-            debug(f"Running: {' '.join(cmd)}")
-            out = subprocess.check_output(cmd, text=True, stderr=subprocess.STDOUT)
-            return out.strip()
-        except subprocess.CalledProcessError as e:
-            debug(f"Error running {' '.join(cmd)}:\n{e.output.strip()}")
-            return ""
+        return run_cmd(cmd)
 
     def get_settings_for(self, name: str, dev_id: Optional[str]) -> Optional[Dict[str, Any]]:
         """Fetch settings giving priority to ID profile, falling back to name profile."""
-        if dev_id and dev_id in self.config.get("by_id", {}):
-            return self.config["by_id"][dev_id]
+        entry = id_profile(self.config, name, dev_id)
+        if entry is not None:
+            return entry
+        name = profile_name(name)
         if name in self.config.get("by_name", {}):
             return self.config["by_name"][name]
         return None
 
-    def _apply_to_device_id(self, device_id: str, speed: float, extended: bool, natural: bool, tapping: bool) -> None:
-        """Apply natural scrolling, tap-to-click, and speed (libinput or CTM) to a specific device id."""
+    def _apply_to_device_id(self, device_id: str, speed: float, extended: bool, natural: bool, tapping: bool,
+                            curve: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Apply natural scrolling, tap-to-click, and speed (libinput or CTM) to a specific device id.
+        With a curve, the custom acceleration profile (or a flat+CTM approximation) replaces speed.
+        """
 
         # 1) Natural scrolling (reverse)
         if self.device_has_prop(device_id, "libinput Natural Scrolling Enabled"):
@@ -519,8 +1327,10 @@ class LibinputGUI(QWidget):
                 "1" if tapping else "0"
             ])
 
-        # 3) Speed: libinput Accel Speed o CTM fallback
-        if extended:
+        # 3) Speed: custom curve, libinput Accel Speed or CTM fallback
+        if curve is not None:
+            self._apply_curve(device_id, curve)
+        elif extended:
             # CTM scale clamped to avoid freezing (no zero/near-zero)
             scale = max(speed, -5.0) if speed < 0 else max(min(speed, 5.0), 0.05)
             matrix = f"{scale} 0 0 0 {scale} 0 0 0 1"
@@ -534,6 +1344,41 @@ class LibinputGUI(QWidget):
                 matrix = f"{scale} 0 0 0 {scale} 0 0 0 1"
                 self.run_cmd(["xinput", "--set-prop", device_id, "Coordinate Transformation Matrix", *matrix.split()])
 
+    def _apply_curve(self, device_id: str, curve: Dict[str, Any]) -> None:
+        """Set a custom accel curve; on drivers without custom accel, use flat profile + CTM gain."""
+        step, points, gain = sample_curve(curve)
+        if self.device_has_prop(device_id, "libinput Accel Custom Motion Points"):
+            # Driver with custom accel: profile flags are (adaptive, flat, custom)
+            self.run_cmd(["xinput", "--set-prop", device_id, "libinput Accel Profile Enabled", "0", "0", "1"])
+            self.run_cmd(["xinput", "--set-prop", device_id, "libinput Accel Custom Motion Step", f"{step:.4f}"])
+            self.run_cmd(["xinput", "--set-prop", device_id, "libinput Accel Custom Motion Points",
+                          *(f"{p:g}" for p in points)])
+            self.reset_ctm(device_id)  # a scale left over from extended mode would multiply the whole curve
+            return
+
+        debug("Custom acceleration not supported; approximating the curve with flat profile + CTM.")
+        if self.device_has_prop(device_id, "libinput Accel Profile Enabled"):
+            self.run_cmd(["xinput", "--set-prop", device_id, "libinput Accel Profile Enabled", "0", "1"])
+        if self.device_has_prop(device_id, "libinput Accel Speed"):
+            # The flat profile still scales by Accel Speed; 0 makes the CTM gain the only factor
+            self.run_cmd(["xinput", "--set-prop", device_id, "libinput Accel Speed", "0.00"])
+        scale = max(min(gain, 5.0), 0.05)
+        matrix = f"{scale:.4f} 0 0 0 {scale:.4f} 0 0 0 1"
+        self.run_cmd(["xinput", "--set-prop", device_id, "Coordinate Transformation Matrix", *matrix.split()])
+
+    def restore_accel_profile(self, device_id: str) -> None:
+        """Undo _apply_curve: back to the adaptive profile and an identity CTM."""
+        if self.device_has_prop(device_id, "libinput Accel Profile Enabled"):
+            flags = ["1", "0", "0"] if self.device_has_prop(device_id, "libinput Accel Custom Motion Points") \
+                else ["1", "0"]
+            self.run_cmd(["xinput", "--set-prop", device_id, "libinput Accel Profile Enabled", *flags])
+        self.reset_ctm(device_id)
+
+    def reset_ctm(self, device_id: str) -> None:
+        """Identity Coordinate Transformation Matrix (undo an extended-mode scale)."""
+        self.run_cmd(["xinput", "--set-prop", device_id, "Coordinate Transformation Matrix",
+                      "1", "0", "0", "0", "1", "0", "0", "0", "1"])
+
     def apply_config_to_device(self, name: str) -> None:
         """Apply the 'by_name' profile to all devices currently reporting that name."""
         cfg = self.get_settings_for(name, None)  # name profile
@@ -543,42 +1388,51 @@ class LibinputGUI(QWidget):
         extended = bool(cfg.get("extended", False))
         natural = bool(cfg.get("natural", False))
         tapping = bool(cfg.get("tapping", False))
+        curve = active_curve(cfg)
 
         # Apply to all matching name devices (from the full device set)
         for dev in self.all_devices:
             if dev["name"] == name:
-                self._apply_to_device_id(dev["id"], speed, extended, natural, tapping)
+                self._apply_to_device_id(dev["id"], speed, extended, natural, tapping, curve)
 
         # Fallback: try pointer:<name> to resolve current ids if discovery hasn't caught up
         out = self.run_cmd(["xinput", "list", "--id-only", f"pointer:{name}"])
         if out:
             for dev_id in out.split():
-                self._apply_to_device_id(dev_id, speed, extended, natural, tapping)
+                self._apply_to_device_id(dev_id, speed, extended, natural, tapping, curve)
 
     def apply_all_configs(self) -> None:
         """Apply all known profiles (by id first, then by name) to connected devices."""
+        if self.devices_stale:
+            # Cached ids may no longer be valid; wait for the background scan
+            self._pending_apply = True
+            return
         if not self.all_devices:
             self.load_devices()
+        self.apply_configs(self.all_devices)
 
+    def apply_configs(self, devices: List[dict]) -> None:
+        """Apply stored profiles (by id first, then by name) to the given devices."""
         # 1) Apply per-ID profiles (highest priority)
-        for dev in self.all_devices:
+        for dev in devices:
             did = dev["id"]
-            cfg = self.config.get("by_id", {}).get(did)
+            cfg = id_profile(self.config, dev["name"], did)
             if cfg:
                 self._apply_to_device_id(
                     did,
                     float(cfg.get("speed", 0.0)),
                     bool(cfg.get("extended", False)),
                     bool(cfg.get("natural", False)),
-                    bool(cfg.get("tapping", False))
+                    bool(cfg.get("tapping", False)),
+                    active_curve(cfg)
                 )
 
         # 2) Apply per-name profiles to devices that didn't get an ID profile
-        applied_ids = {d["id"] for d in self.all_devices if d["id"] in self.config.get("by_id", {})}
-        for dev in self.all_devices:
+        applied_ids = {d["id"] for d in devices if id_profile(self.config, d["name"], d["id"]) is not None}
+        for dev in devices:
             if dev["id"] in applied_ids:
                 continue
-            name = dev["name"]
+            name = profile_name(dev["name"])
             cfg = self.config.get("by_name", {}).get(name)
             if cfg:
                 self._apply_to_device_id(
@@ -586,42 +1440,354 @@ class LibinputGUI(QWidget):
                     float(cfg.get("speed", 0.0)),
                     bool(cfg.get("extended", False)),
                     bool(cfg.get("natural", False)),
-                    bool(cfg.get("tapping", False))
+                    bool(cfg.get("tapping", False)),
+                    active_curve(cfg)
                 )
 
-        # Ensure something is selected in the UI
-        if self.device_list.currentRow() < 0 and self.device_list.count() > 0:
+    def apply_speed_preset(self, name: str, dev_id: str, speed: float) -> None:
+        """Store a libinput speed preset in the device's active profile and apply it."""
+        profile = id_profile(self.config, name, dev_id)
+        if profile is None:
+            profile = self.config.setdefault("by_name", {}).setdefault(name, {})
+        was_extended = bool(profile.get("extended", False))
+        profile["speed"] = speed
+        profile["extended"] = False
+        profile.setdefault("natural", False)
+        profile.setdefault("tapping", True)  # same default as a device without profile
+        had_curve = active_curve(profile) is not None
+        profile["curve_enabled"] = False     # a preset is a plain libinput speed
+        self.save_config()
+        for target in self.with_scroll_clone(dev_id):
+            if had_curve:
+                self.restore_accel_profile(target)
+            elif was_extended:
+                self.reset_ctm(target)
+            self._apply_to_device_id(target, speed, False, bool(profile["natural"]), bool(profile["tapping"]))
+        self.profiles_changed.emit()
+
+
+# --------------------------
+# Main window
+# --------------------------
+
+class LibinputGUI(QWidget):
+    """Main window for xinput-plus; a view over a shared DeviceManager."""
+    def __init__(self, manager: DeviceManager) -> None:
+        super().__init__()
+        self.setWindowTitle("xinput-plus")
+        self.setMinimumWidth(800)
+
+        # Window icon: theme → installed paths → dev fallback
+        self.setWindowIcon(get_app_icon())
+
+        # State
+        self.manager = manager
+        self.visible_devices: List[dict] = []      # filtered by whitelist mode
+        self.selected_device_name: str = ""
+        self.selected_device_id: Optional[str] = None
+        self._shown_stale: bool = False            # list currently painted from the cache
+        self.curve: Optional[Dict[str, Any]] = None  # selected profile's curve (if ever edited)
+        self.curve_enabled: bool = False
+        self._scan_warned: bool = False            # "no device list" dialog already shown
+
+        # UI
+        self.build_ui()
+        self.manager.devices_changed.connect(self.on_devices_changed)
+        self.manager.scan_failed.connect(self.on_scan_failed)
+        self.manager.profiles_changed.connect(self._load_selected_profile)
+        self.on_devices_changed()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """The manager's live config dict."""
+        return self.manager.config
+
+    @property
+    def all_devices(self) -> List[dict]:
+        """All slave pointers currently known to the manager."""
+        return self.manager.all_devices
+
+    @property
+    def devices_stale(self) -> bool:
+        """True while the manager only has the cached snapshot."""
+        return self.manager.devices_stale
+
+    # --------------------------
+    # UI
+    # --------------------------
+    def build_ui(self) -> None:
+        """Construct the main layout and bind signals."""
+        layout = QHBoxLayout(self)
+
+        # Device list (left column) with a status line for cached/refreshing state
+        left = QVBoxLayout()
+        self.device_list = QListWidget()
+        self.device_list.itemSelectionChanged.connect(self.on_device_selected)
+        left.addWidget(self.device_list)
+
+        self.label_status = QLabel("")
+        left.addWidget(self.label_status)
+        layout.addLayout(left, 2)
+
+        # Right panel with controls
+        right = QVBoxLayout()
+
+        self.label_device = QLabel(self.tr("Select a device"))
+        right.addWidget(self.label_device)
+
+        self.extended_speed_cb = QCheckBox(self.tr("Extra speed (for slow devices)"))
+        self.extended_speed_cb.toggled.connect(self.on_extended_toggled)
+        right.addWidget(self.extended_speed_cb)
+
+        self.profile_by_id_cb = QCheckBox(self.tr("Save by ID (specific profile)"))
+        right.addWidget(self.profile_by_id_cb)
+
+        # Natural scrolling (reverse) toggle
+        self.natural_scroll_cb = QCheckBox(self.tr("Natural scrolling (reverse)"))
+        self.natural_scroll_cb.toggled.connect(self.on_natural_toggled)
+        right.addWidget(self.natural_scroll_cb)
+
+        # Tap-to-click (enable left-click on touchpads)
+        self.tapping_cb = QCheckBox(self.tr("Tap to click (enable left-click)"))
+        self.tapping_cb.setChecked(True)  # default ON
+        self.tapping_cb.toggled.connect(self.on_tapping_toggled)
+        right.addWidget(self.tapping_cb)
+
+        # Scroll multiplier (user-space evdev → uinput pipeline; 1 or 0 = off, negative = inverted)
+        scroll_row = QHBoxLayout()
+        scroll_row.addWidget(QLabel(self.tr("Scroll speed")))
+        self.scroll_spin = QDoubleSpinBox()
+        self.scroll_spin.setRange(-10.0, 10.0)
+        self.scroll_spin.setSingleStep(0.25)
+        self.scroll_spin.setDecimals(2)
+        self.scroll_spin.setPrefix("×")
+        self.scroll_spin.setValue(1.0)
+        if scroll_available():
+            self.scroll_spin.setToolTip(self.tr("1 or 0 = unchanged, negative = inverted. "
+                                                "Needs access to /dev/input and /dev/uinput."))
+        else:
+            self.scroll_spin.setToolTip(self.tr("Install python3-evdev to change the scroll speed."))
+        self.scroll_spin.valueChanged.connect(self.on_scroll_changed)
+        scroll_row.addWidget(self.scroll_spin)
+        scroll_row.addStretch(1)
+        right.addLayout(scroll_row)
+
+        self.label_speed = QLabel(self.tr("Speed: 0.00"))
+        right.addWidget(self.label_speed)
+
+        self.slider_speed = QSlider(Qt.Orientation.Horizontal)
+        self.slider_speed.setMinimum(-100)
+        self.slider_speed.setMaximum(100)
+        self.slider_speed.setValue(0)
+        self.slider_speed.setSingleStep(1)
+        self.slider_speed.valueChanged.connect(self.on_speed_changed)
+        right.addWidget(self.slider_speed)
+
+        # Buttons row
+        # ----- Row 1: main actions -----
+        row1 = QHBoxLayout()
+
+        self.btn_refresh = QPushButton(self.tr("🔄 Refresh"))
+        self.btn_refresh.clicked.connect(self.load_devices)
+        row1.addWidget(self.btn_refresh)
+
+        self.btn_reapply = QPushButton(self.tr("⚙️ Re-apply all"))
+        self.btn_reapply.clicked.connect(self.manager.apply_all_configs)
+        row1.addWidget(self.btn_reapply)
+
+        self.show_only_whitelist_cb = QCheckBox(self.tr("Show only whitelist"))
+        self.show_only_whitelist_cb.setChecked(bool(self.config.get("_show_only_whitelist", False)))
+        self.show_only_whitelist_cb.toggled.connect(self.on_toggle_show_only_whitelist)
+        row1.addWidget(self.show_only_whitelist_cb)
+
+        row1.addStretch(1)
+
+        # ----- Row 2: whitelist editor and about -----
+        row2 = QHBoxLayout()
+
+        self.btn_edit_whitelist = QPushButton(self.tr("✏️ Edit whitelist"))
+        self.btn_edit_whitelist.clicked.connect(self.open_whitelist_dialog)
+        row2.addWidget(self.btn_edit_whitelist)
+
+        self.btn_curve = QPushButton(self.tr("📈 Acceleration curve…"))
+        self.btn_curve.clicked.connect(self.open_curve_dialog)
+        row2.addWidget(self.btn_curve)
+
+        self.btn_about = QPushButton(self.tr("🛈 About"))
+        self.btn_about.clicked.connect(self.show_about)
+        row2.addWidget(self.btn_about)
+
+        row2.addStretch(1)
+
+        # Add both rows to the right panel
+        right.addLayout(row1)
+        right.addLayout(row2)
+        
+        right.addStretch(1)
+
+        layout.addLayout(right, 3)
+
+    # --------------------------
+    # Device discovery & list
+    # --------------------------
+    def _compute_visible(self) -> None:
+        """Compute visible_devices by applying the whitelist (if enabled and non-empty)."""
+        self.visible_devices = self.manager.visible_devices()
+
+    def _set_controls_enabled(self, enabled: bool) -> None:
+        """Enable/disable the per-device controls (disabled while ids may be stale)."""
+        for w in (self.extended_speed_cb, self.profile_by_id_cb, self.natural_scroll_cb,
+                  self.tapping_cb, self.slider_speed, self.btn_reapply, self.btn_curve):
+            w.setEnabled(enabled)
+        self.scroll_spin.setEnabled(enabled and scroll_available())
+        # A custom curve replaces the scalar speed
+        self.slider_speed.setEnabled(enabled and not self.curve_enabled)
+        self.extended_speed_cb.setEnabled(enabled and not self.curve_enabled)
+
+    def _sync_device_list(self) -> None:
+        """Bring the list widget in line with visible_devices, touching only rows that differ."""
+        wanted = [(d["name"], d["id"]) for d in self.visible_devices]
+        wanted_set = set(wanted)
+
+        # 1) Drop rows for devices that are gone
+        for row in reversed(range(self.device_list.count())):
+            item = self.device_list.item(row)
+            key = (item.data(Qt.ItemDataRole.UserRole + 1), item.data(Qt.ItemDataRole.UserRole))
+            if key not in wanted_set:
+                self.device_list.takeItem(row)
+
+        # 2) Insert new rows / move existing ones into place
+        for row, (name, did) in enumerate(wanted):
+            item = self.device_list.item(row)
+            if item is not None and (item.data(Qt.ItemDataRole.UserRole + 1),
+                                     item.data(Qt.ItemDataRole.UserRole)) == (name, did):
+                continue
+            moved = None
+            for other in range(row + 1, self.device_list.count()):
+                cand = self.device_list.item(other)
+                if (cand.data(Qt.ItemDataRole.UserRole + 1), cand.data(Qt.ItemDataRole.UserRole)) == (name, did):
+                    moved = self.device_list.takeItem(other)
+                    break
+            if moved is None:
+                # Paint the list with "Name  (id N)" and store id/name in item data roles
+                moved = QListWidgetItem(f"{name}  (id {did})")
+                moved.setData(Qt.ItemDataRole.UserRole, did)
+                moved.setData(Qt.ItemDataRole.UserRole + 1, name)
+            self.device_list.insertItem(row, moved)
+
+        # 3) Cached rows are shown in italics until revalidated
+        for row in range(self.device_list.count()):
+            item = self.device_list.item(row)
+            font = item.font()
+            font.setItalic(self.devices_stale)
+            item.setFont(font)
+
+        # Default selection for convenience
+        if not self.device_list.selectedItems() and self.device_list.count() > 0:
             self.device_list.setCurrentRow(0)
 
+    def on_devices_changed(self) -> None:
+        """Repaint from the manager's snapshot, touching only rows that changed."""
+        was_stale = self._shown_stale
+        self._shown_stale = self.devices_stale
+        if self.all_devices:
+            self._scan_warned = False  # warn again if the list is ever lost
+        before = (self.selected_device_name, self.selected_device_id)
+
+        self._compute_visible()
+        self.device_list.blockSignals(True)
+        self._sync_device_list()
+        self.device_list.blockSignals(False)
+        self._set_controls_enabled(not self.devices_stale)
+        self.label_status.setText(self.tr("Cached devices, refreshing…") if self.devices_stale else "")
+
+        # Selection may have moved, or been made on the cached list: sync controls and apply once
+        items = self.device_list.selectedItems()
+        after = ((items[0].data(Qt.ItemDataRole.UserRole + 1), items[0].data(Qt.ItemDataRole.UserRole))
+                 if items else ("", None))
+        if after != before or (was_stale and not self.devices_stale):
+            self.on_device_selected()
+
+    def on_scan_failed(self) -> None:
+        """Report a failed background scan; keep whatever list is shown."""
+        if not self.all_devices:
+            self.label_status.setText(self.tr("Could not obtain the device list.\nIs xinput available?"))
+            if self._scan_warned:
+                return  # tray mode rescans every few seconds; don't stack dialogs
+            self._scan_warned = True
+            QMessageBox.warning(
+                self,
+                "xinput",
+                self.tr("Could not obtain the device list.\nIs xinput available?")
+            )
+        else:
+            self.label_status.setText(self.tr("Could not refresh devices; showing cached list."))
+
+    def load_devices(self) -> None:
+        """Scan all slave pointers via xinput, then repopulate the visible list."""
+        if not self.manager.load_devices():
+            QMessageBox.warning(
+                self,
+                "xinput",
+                self.tr("Could not obtain the device list.\nIs xinput available?")
+            )
+            return
+        # The snapshot may be unchanged (no signal), but the whitelist filter may not be
+        self.on_devices_changed()
+
     # --------------------------
     # UI slots
     # --------------------------
     def on_device_selected(self) -> None:
         """Sync UI state when a device item is selected; apply stored profile."""
+        values = self._load_selected_profile()
+        if values is None:
+            return
+        speed, extended, natural, tapping = values
+
+        # Apply immediately to give instant feedback (not on cached ids)
+        did = self.selected_device_id
+        if did and not self.devices_stale:
+            for target in self.manager.with_scroll_clone(did):
+                self.manager._apply_to_device_id(target, speed, extended, natural, tapping, self._active_curve())
+
+    def _load_selected_profile(self) -> Optional[Tuple[float, bool, bool, bool]]:
+        """Show the selected device's stored profile in the controls; return its values."""
         items = self.device_list.selectedItems()
         if not items:
-            return
+            return None
         item = items[0]
         self.selected_device_id = item.data(Qt.ItemDataRole.UserRole)
         self.selected_device_name = item.data(Qt.ItemDataRole.UserRole + 1)
 
         name, did = self.selected_device_name, self.selected_device_id
-        cfg = self.get_settings_for(name, did)
+        cfg = self.manager.get_settings_for(name, did)
 
         if cfg:
             speed = float(cfg.get("speed", 0.0))
             extended = bool(cfg.get("extended", False))
             natural = bool(cfg.get("natural", False))
             tapping = bool(cfg.get("tapping", False))
+            self.curve = cfg.get("curve")
+            self.curve_enabled = active_curve(cfg) is not None
+            scroll = scroll_multiplier(cfg)
         else:
             speed = 0.0
             extended = False
             natural = False
             tapping = True   # ← default ON
+            self.curve = None
+            self.curve_enabled = False
+            scroll = 1.0
+        self._set_controls_enabled(not self.devices_stale)
+
+        self.scroll_spin.blockSignals(True)
+        self.scroll_spin.setValue(scroll)
+        self.scroll_spin.blockSignals(False)
 
         # Auto-check "Save by ID" if we already have a per-ID profile for this device
         self.profile_by_id_cb.blockSignals(True)
-        self.profile_by_id_cb.setChecked(bool(did and did in self.config.get("by_id", {})))
+        self.profile_by_id_cb.setChecked(id_profile(self.config, name, did) is not None)
         self.profile_by_id_cb.blockSignals(False)
 
         self.extended_speed_cb.blockSignals(True)
@@ -647,19 +1813,20 @@ class LibinputGUI(QWidget):
         else:
             self.label_device.setText(self.tr("Device: {name}").format(name=name))
         self.label_speed.setText(self.tr("Speed: {val:.2f}").format(val=speed))
-
-        # Apply immediately to give instant feedback
-        if did:
-            self._apply_to_device_id(did, speed, extended, natural, tapping)
-
-    def on_speed_changed(self, value: int) -> None:
-        """Persist current slider value and apply it to the selected device."""
-        if not self.selected_device_name:
+        return speed, extended, natural, tapping
+
+    def on_speed_changed(self, value: int, retry_scroll: bool = False) -> None:
+        """
+        Persist current slider value and apply it to the selected device.
+        retry_scroll: also retry scroll pipelines that failed to start (only when the multiplier changed).
+        """
+        if not self.selected_device_name or self.devices_stale:
             return
 
         extended = self.extended_speed_cb.isChecked()
         natural = self.natural_scroll_cb.isChecked()
         tapping = self.tapping_cb.isChecked()
+        scroll = self.scroll_spin.value()
         speed = value / 100.0
         did = self.selected_device_id
         name = self.selected_device_name
@@ -671,24 +1838,68 @@ class LibinputGUI(QWidget):
         self.config["by_name"][name]["extended"] = extended
         self.config["by_name"][name]["natural"] = natural
         self.config["by_name"][name]["tapping"] = tapping
+        self.config["by_name"][name]["scroll_multiplier"] = scroll
+        if self.curve is not None:
+            self.config["by_name"][name]["curve"] = self.curve
+            self.config["by_name"][name]["curve_enabled"] = self.curve_enabled
 
         # Optionally store by ID
         if self.profile_by_id_cb.isChecked() and did:
-            self.config.setdefault("by_id", {})
-            self.config["by_id"].setdefault(did, {})
-            self.config["by_id"][did]["speed"] = speed
-            self.config["by_id"][did]["extended"] = extended
-            self.config["by_id"][did]["natural"] = natural
-            self.config["by_id"][did]["tapping"] = tapping
+            values = {"speed": speed, "extended": extended, "natural": natural, "tapping": tapping,
+                      "scroll_multiplier": scroll}
+            if self.curve is not None:
+                values.update(curve=self.curve, curve_enabled=self.curve_enabled)
+            self.manager.store_id_profile(name, did, values)
 
-        self.save_config()
+        self.manager.save_config()
         self.label_speed.setText(self.tr("Speed: {val:.2f}").format(val=speed))
 
         # Apply to selected device by exact ID when available
         if did:
-            self._apply_to_device_id(did, speed, extended, natural, tapping)
+            for target in self.manager.with_scroll_clone(did):
+                self.manager._apply_to_device_id(target, speed, extended, natural, tapping, self._active_curve())
         else:
-            self.apply_config_to_device(name)
+            self.manager.apply_config_to_device(name)
+        self.manager.sync_scroll_pipelines(retry=retry_scroll)
+
+    def _active_curve(self) -> Optional[Dict[str, Any]]:
+        """The selected profile's curve when enabled, else None."""
+        return active_curve({"curve": self.curve, "curve_enabled": self.curve_enabled})
+
+    def open_curve_dialog(self) -> None:
+        """Edit the selected device's acceleration curve, applying every valid edit live."""
+        did = self.selected_device_id
+        if not did or self.devices_stale:
+            return
+        was_enabled = self.curve_enabled
+
+        def preview(curve: Optional[Dict[str, Any]]) -> None:
+            for target in self.manager.with_scroll_clone(did):
+                if curve is None:
+                    self.manager.restore_accel_profile(target)
+                    self.manager._apply_to_device_id(target, self.slider_speed.value() / 100.0,
+                                                     self.extended_speed_cb.isChecked(),
+                                                     self.natural_scroll_cb.isChecked(), self.tapping_cb.isChecked())
+                else:
+                    self.manager._apply_curve(target, curve)
+
+        dlg = CurveDialog(self, self.curve, self.curve_enabled)
+        dlg.curve_changed.connect(preview)
+        if dlg.exec() == QDialog.DialogCode.Accepted:
+            self.curve = dlg.result_curve()
+            self.curve_enabled = dlg.result_enabled()
+            self._set_controls_enabled(True)
+            if was_enabled and not self.curve_enabled:
+                for target in self.manager.with_scroll_clone(did):
+                    self.manager.restore_accel_profile(target)
+            self.on_speed_changed(self.slider_speed.value())
+        else:
+            # Put back what is saved
+            if not was_enabled:
+                for target in self.manager.with_scroll_clone(did):
+                    self.manager.restore_accel_profile(target)
+            self.on_device_selected()
+        dlg.deleteLater()
 
     def on_extended_toggled(self, checked: bool) -> None:
         """Adjust slider range when toggling CTM mode; re-apply setting."""
@@ -724,20 +1935,24 @@ class LibinputGUI(QWidget):
         # checkbox widget directly inside on_speed_changed.
         self.on_speed_changed(self.slider_speed.value())
 
+    def on_scroll_changed(self, value: float) -> None:
+        """Re-apply settings (and retune the scroll pipeline) when the multiplier changes."""
+        self.on_speed_changed(self.slider_speed.value(), retry_scroll=True)
+
     def on_toggle_show_only_whitelist(self, checked: bool) -> None:
         """Toggle 'show only whitelist' mode and refresh the device list."""
         self.config["_show_only_whitelist"] = bool(checked)
-        self.save_config()
-        self.load_devices()
+        self.manager.save_config()
+        self.on_devices_changed()
 
     def open_whitelist_dialog(self) -> None:
         """Open the whitelist editor dialog; save and reload on acceptance."""
-        wl_set = self._whitelist_set()
-        dlg = WhitelistDialog(self, self.all_devices, wl_set)
+        dlg = WhitelistDialog(self, self.all_devices, self.config.get("_whitelist", []))
         if dlg.exec() == QDialog.DialogCode.Accepted:
             self.config["_whitelist"] = dlg.result_whitelist()
-            self.save_config()
-            self.load_devices()
+            self.manager.save_config()
+            self.on_devices_changed()
+        dlg.deleteLater()  # don't keep the dialog alive as a child of the window
 
     def show_about(self) -> None:
         """Show an About dialog with translatable HTML content."""
@@ -765,6 +1980,478 @@ class LibinputGUI(QWidget):
         QMessageBox.about(self, self.tr("About xinput-plus"), about_html)
 
 
+# --------------------------
+# System tray (resident mode)
+# --------------------------
+
+# Interval between background scans in tray mode (hotplug detection).
+TRAY_WATCH_INTERVAL_MS = 3000
+
+class TrayApp(QObject):
+    """
+    Tray-resident front end: keeps only the DeviceManager alive and builds the
+    main window on demand; the window is destroyed again when closed.
+    """
+    def __init__(self, manager: DeviceManager) -> None:
+        super().__init__()
+        self.manager = manager
+        self._window: Optional[LibinputGUI] = None
+        self._submenus: List[QMenu] = []
+
+        self.menu = QMenu()
+        self.menu.aboutToShow.connect(self._rebuild_menu)
+
+        self.tray = QSystemTrayIcon(get_app_icon(), self)
+        self.tray.setToolTip("xinput-plus")
+        self.tray.setContextMenu(self.menu)
+        self.tray.activated.connect(self._on_activated)
+
+    def speed_presets(self) -> List[Tuple[str, float]]:
+        """(label, libinput speed) pairs offered in the tray menu."""
+        return [
+            (self.tr("Slow"), -0.5),
+            (self.tr("Default"), 0.0),
+            (self.tr("Fast"), 0.5),
+            (self.tr("Fastest"), 1.0),
+        ]
+
+    def show(self) -> None:
+        """Show the tray icon (the window stays unbuilt until requested)."""
+        self.tray.show()
+
+    def open_window(self) -> None:
+        """Build the main window if needed and bring it to the front."""
+        if self._window is None:
+            self._window = LibinputGUI(self.manager)
+            self._window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            self._window.destroyed.connect(self._on_window_destroyed)
+        self._window.show()
+        self._window.raise_()
+        self._window.activateWindow()
+
+    def _on_window_destroyed(self) -> None:
+        """Forget the closed window so the next open builds a fresh one."""
+        self._window = None
+
+    def _on_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
+        """Left click opens the window (or closes it if already open)."""
+        if reason != QSystemTrayIcon.ActivationReason.Trigger:
+            return
+        if self._window is not None and self._window.isVisible():
+            self._window.close()
+        else:
+            self.open_window()
+
+    def _rebuild_menu(self) -> None:
+        """Fill the menu right before it is shown, so it reflects the current devices."""
+        for sub in self._submenus:
+            sub.deleteLater()
+        self._submenus = []
+        self.menu.clear()
+
+        self.menu.addAction(self.tr("Open xinput-plus"), self.open_window)
+        self.menu.addSeparator()
+
+        if self.manager.devices_stale:
+            act = self.menu.addAction(self.tr("Cached devices, refreshing…"))
+            act.setEnabled(False)
+        else:
+            for dev in self.manager.visible_devices():
+                name, did = dev["name"], dev["id"]
+                sub = QMenu(f"{name}  (id {did})", self.menu)
+                self._submenus.append(sub)
+                cfg = self.manager.get_settings_for(name, did) or {}
+                current = None if cfg.get("extended") else float(cfg.get("speed", 0.0))
+                for label, speed in self.speed_presets():
+                    act = QAction(label, sub)
+                    act.setCheckable(True)
+                    act.setChecked(current is not None and abs(current - speed) < 1e-6)
+                    act.triggered.connect(
+                        lambda _checked=False, n=name, i=did, v=speed: self.manager.apply_speed_preset(n, i, v)
+                    )
+                    sub.addAction(act)
+                self.menu.addMenu(sub)
+
+        self.menu.addSeparator()
+        self.menu.addAction(self.tr("⚙️ Re-apply all"), self.manager.apply_all_configs)
+        self.menu.addAction(self.tr("Quit"), QCoreApplication.quit)
+
+
+# --------------------------
+# Measurement probe (--probe)
+# --------------------------
+
+PROBE_DEVICE_NAME = "xinput-plus probe"      # uinput mouse created by --probe=uinput
+PROBE_MAGIC = b"XIPPROBE\x01"                # file: magic, u32 + JSON metadata, then records
+PROBE_RECORD = struct.Struct("<QB3xff")      # t_ns (CLOCK_MONOTONIC), kind, a, b
+PROBE_FLUSH_RECORDS = 1024                   # records buffered before each write
+PROBE_INTERVAL_MS = 8.0                      # injection period (125 Hz, a common mouse rate)
+PROBE_LEVELS = (1, 2, 3, 5, 8, 12, 18, 27)   # counts per event, one gain curve point each
+PROBE_LEVEL_EVENTS = 40                      # events injected per level
+PROBE_DELAY_STEP = 5                         # counts per event while a setting change is applied
+PROBE_DELAY_WINDOW = 1.0                     # seconds watched after the xinput calls return
+PROBE_MAX_GAIN = 4.0                         # assumed worst case when deciding to re-centre
+PROBE_SKIP = 2                               # events ignored after each re-centre (velocity settles)
+
+# Record kinds. INJECT/RAW/COOKED carry (dx, dy); MARK carries (MARK_* code, value).
+PROBE_INJECT, PROBE_RAW, PROBE_COOKED, PROBE_MARK = range(4)
+MARK_PHASE, MARK_LEVEL, MARK_LEVEL_END, MARK_WARP, MARK_SET, MARK_SET_DONE = range(1, 7)
+PHASE_BEFORE, PHASE_DELAY, PHASE_AFTER = range(3)
+
+_X_GENERIC_EVENT = 35
+# xXIRawEvent after the generic event header: deviceid, time, detail, sourceid,
+# valuators_len, flags, pad; then the valuator mask and two FP3232 value lists.
+_XI_RAW_HEAD = struct.Struct("<HIIHHI4x")
+_FP3232 = struct.Struct("<iI")
+
+def probe_available() -> bool:
+    """True when python-xlib is installed (the X server and injector are checked on start)."""
+    return xdisplay is not None
+
+def parse_raw_motion(data: bytes) -> Optional[Tuple[int, float, float]]:
+    """
+    (sourceid, raw dx, raw dy) from the body of an XI_RawMotion event; python-xlib
+    has no parser for raw events and hands over the bytes after the GE header.
+    """
+    if len(data) < _XI_RAW_HEAD.size:
+        return None
+    _dev, _time, _detail, sourceid, mask_len, _flags = _XI_RAW_HEAD.unpack_from(data)
+    off = _XI_RAW_HEAD.size
+    mask = int.from_bytes(data[off:off + mask_len * 4], "little")
+    count = bin(mask).count("1")
+    raw_off = off + mask_len * 4 + count * _FP3232.size  # raw values follow the accelerated ones
+    if len(data) < raw_off + count * _FP3232.size:
+        return None
+    raw = [0.0, 0.0]
+    idx = 0
+    for axis in (0, 1):
+        if mask >> axis & 1:
+            integral, frac = _FP3232.unpack_from(data, raw_off + idx * _FP3232.size)
+            raw[axis] = integral + frac / 4294967296.0
+            idx += 1
+    return sourceid, raw[0], raw[1]
+
+
+class ProbeWriter:
+    """Streams probe records to disk through one preallocated buffer."""
+    def __init__(self, path: str, meta: Dict[str, Any]) -> None:
+        self._f = open(path, "wb")
+        blob = json.dumps(meta).encode("utf-8")
+        self._f.write(PROBE_MAGIC + struct.pack("<I", len(blob)) + blob)
+        self._buf = bytearray(PROBE_RECORD.size * PROBE_FLUSH_RECORDS)
+        self._n = 0
+        self.count = 0
+
+    def add(self, kind: int, a: float, b: float, t_ns: Optional[int] = None) -> None:
+        PROBE_RECORD.pack_into(self._buf, self._n * PROBE_RECORD.size,
+                               time.monotonic_ns() if t_ns is None else t_ns, kind, a, b)
+        self._n += 1
+        self.count += 1
+        if self._n == PROBE_FLUSH_RECORDS:
+            self.flush()
+
+    def flush(self) -> None:
+        self._f.write(memoryview(self._buf)[:self._n * PROBE_RECORD.size])
+        self._f.flush()
+        self._n = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._f.close()
+
+def read_probe(path: str) -> Tuple[Dict[str, Any], List[Tuple[int, int, float, float]]]:
+    """Load a probe file: (metadata, [(t_ns, kind, a, b), ...]); a truncated last record is dropped."""
+    data = Path(path).read_bytes()
+    if not data.startswith(PROBE_MAGIC):
+        raise ValueError(f"{path}: not an xinput-plus probe file")
+    off = len(PROBE_MAGIC)
+    (length,) = struct.unpack_from("<I", data, off)
+    off += 4
+    meta = json.loads(data[off:off + length].decode("utf-8"))
+    off += length
+    end = off + (len(data) - off) // PROBE_RECORD.size * PROBE_RECORD.size
+    return meta, list(PROBE_RECORD.iter_unpack(data[off:end]))
+
+
+class XTestInjector:
+    """Relative motion through the server's XTEST pointer; works under Xvfb."""
+    mode = "xtest"
+
+    def __init__(self, disp) -> None:
+        self.disp = disp
+        self.name = "Virtual core XTEST pointer"
+        self.device_id = run_cmd(["xinput", "list", "--id-only", self.name]) or None
+
+    def move(self, dx: int, dy: int) -> None:
+        xtest.fake_input(self.disp, X.MotionNotify, detail=1, x=dx, y=dy)  # detail=1: relative
+        self.disp.flush()
+
+    def close(self) -> None:
+        pass
+
+class UInputInjector:
+    """Relative motion from a virtual uinput mouse, i.e. through the real input driver."""
+    mode = "uinput"
+
+    def __init__(self, disp, timeout: float = 5.0) -> None:
+        self.disp = disp
+        self.name = PROBE_DEVICE_NAME
+        self.device_id: Optional[str] = None
+        ec = evdev.ecodes
+        self._ui = evdev.UInput({ec.EV_KEY: [ec.BTN_LEFT, ec.BTN_RIGHT], ec.EV_REL: [ec.REL_X, ec.REL_Y]},
+                                name=self.name)
+        deadline = time.monotonic() + timeout
+        while self.device_id is None and time.monotonic() < deadline:
+            time.sleep(0.1)
+            for dev in parse_device_list(run_cmd(["xinput", "list", "--short"])):
+                if dev["name"] == self.name:
+                    self.device_id = dev["id"]
+        if self.device_id is not None:
+            time.sleep(0.3)  # let the driver finish setting the device up
+
+    def move(self, dx: int, dy: int) -> None:
+        ec = evdev.ecodes
+        if dx:
+            self._ui.write(ec.EV_REL, ec.REL_X, dx)
+        if dy:
+            self._ui.write(ec.EV_REL, ec.REL_Y, dy)
+        self._ui.syn()
+
+    def close(self) -> None:
+        self._ui.close()
+
+
+class MotionProbe:
+    """
+    One measurement run: injects relative motion along x with an injector, receives
+    the XI2 raw and cooked motion of that source device and streams everything
+    (plus phase/level markers for the analysis) to a ProbeWriter. The pointer is
+    warped back to the screen centre before it could reach an edge.
+    """
+    def __init__(self, disp, injector, writer: ProbeWriter) -> None:
+        self.disp = disp
+        self.injector = injector
+        self.writer = writer
+        self.source = int(injector.device_id)
+        self.root = disp.screen().root
+        self.center_xy = (disp.screen().width_in_pixels // 2, disp.screen().height_in_pixels // 2)
+        self._interval = PROBE_INTERVAL_MS / 1000.0
+        self._opcode = disp.query_extension("XInputExtension").major_opcode
+        self._last: Optional[Tuple[float, float]] = None
+        self._warping = False
+        self._travel = float("inf")  # forces a re-centre before the first event
+        self._next = time.monotonic()
+
+        disp.xinput_query_version()
+        self.root.xinput_select_events([(xi.AllDevices, xi.RawMotionMask),
+                                        (xi.AllMasterDevices, xi.MotionMask)])
+        disp.sync()
+
+    def drain(self, until: float) -> None:
+        """Record pending X events until the monotonic time `until`."""
+        fd = self.disp.fileno()
+        while True:
+            while self.disp.pending_events():
+                self._handle(self.disp.next_event())
+            left = until - time.monotonic()
+            if left <= 0:
+                return
+            select.select([fd], [], [], left)
+
+    def _handle(self, ev) -> None:
+        if ev.type != _X_GENERIC_EVENT or ev.extension != self._opcode:
+            return
+        now = time.monotonic_ns()
+        if ev.evtype == xi.RawMotion:
+            parsed = parse_raw_motion(bytes(ev.data))
+            if parsed is not None and parsed[0] == self.source:
+                self.writer.add(PROBE_RAW, parsed[1], parsed[2], now)
+        elif ev.evtype == xi.Motion and ev.data.sourceid == self.source and not self._warping:
+            pos = (ev.data.root_x, ev.data.root_y)
+            if self._last is not None:
+                dx, dy = pos[0] - self._last[0], pos[1] - self._last[1]
+                self._travel += abs(dx)
+                self.writer.add(PROBE_COOKED, dx, dy, now)
+            self._last = pos
+
+    def center(self) -> None:
+        """Collect trailing events, then warp the pointer to the screen centre."""
+        self.drain(time.monotonic() + 2 * self._interval)
+        self._warping = True
+        self.root.warp_pointer(*self.center_xy)
+        self.disp.sync()
+        self.drain(time.monotonic() + 2 * self._interval)
+        self._warping = False
+        pointer = self.root.query_pointer()
+        self._last = (float(pointer.root_x), float(pointer.root_y))
+        self._travel = 0.0
+        self.writer.add(PROBE_MARK, MARK_WARP, 0)
+        self._next = time.monotonic()
+
+    def inject(self, step: int, count: int) -> None:
+        """Inject `count` events of `step` counts, one per PROBE_INTERVAL_MS."""
+        for _ in range(count):
+            if self._travel + step * PROBE_MAX_GAIN > self.center_xy[0] - 8:
+                self.center()
+            self.injector.move(step, 0)
+            self.writer.add(PROBE_INJECT, step, 0)
+            self._next = max(self._next + self._interval, time.monotonic())  # no catch-up bursts
+            self.drain(self._next)
+
+    def gain_levels(self) -> None:
+        """One block of PROBE_LEVEL_EVENTS per entry of PROBE_LEVELS."""
+        for step in PROBE_LEVELS:
+            self.writer.add(PROBE_MARK, MARK_LEVEL, step)
+            self._travel = float("inf")
+            self.inject(step, PROBE_LEVEL_EVENTS)
+            self.drain(time.monotonic() + 4 * self._interval)
+            self.writer.add(PROBE_MARK, MARK_LEVEL_END, step)
+
+    def watch_apply(self, apply) -> None:
+        """
+        Keep injecting at PROBE_DELAY_STEP while apply() runs on a worker thread and
+        for PROBE_DELAY_WINDOW after it returns, so the first changed event can be
+        timed against both ends of the call.
+        """
+        step = PROBE_DELAY_STEP
+        self.writer.add(PROBE_MARK, MARK_LEVEL, step)
+        self._travel = float("inf")
+        self.inject(step, PROBE_LEVEL_EVENTS)  # baseline ratio
+
+        done: List[int] = []
+        worker = threading.Thread(target=lambda: (apply(), done.append(time.monotonic_ns())),
+                                  name="probe apply", daemon=True)
+        self.writer.add(PROBE_MARK, MARK_SET, 0)
+        worker.start()
+        while not done:
+            self.inject(step, 1)
+        self.writer.add(PROBE_MARK, MARK_SET_DONE, 0, done[0])
+        end = time.monotonic() + PROBE_DELAY_WINDOW
+        while time.monotonic() < end:
+            self.inject(step, 1)
+        worker.join()
+        self.drain(time.monotonic() + 4 * self._interval)
+        self.writer.add(PROBE_MARK, MARK_LEVEL_END, step)
+
+    def run(self, manager: "DeviceManager", baseline: Dict[str, Any], target: Dict[str, Any]) -> None:
+        """Gain curve with `baseline`, timed switch to `target`, gain curve with `target`."""
+        dev_id = str(self.source)
+
+        def apply(settings: Dict[str, Any]) -> None:
+            manager._apply_to_device_id(dev_id, settings["speed"], settings["extended"], False, False,
+                                        settings.get("curve"))
+
+        manager.restore_accel_profile(dev_id)
+        apply(baseline)
+        self.writer.add(PROBE_MARK, MARK_PHASE, PHASE_BEFORE)
+        self.gain_levels()
+        self.writer.add(PROBE_MARK, MARK_PHASE, PHASE_DELAY)
+        self.watch_apply(lambda: apply(target))
+        self.writer.add(PROBE_MARK, MARK_PHASE, PHASE_AFTER)
+        self.gain_levels()
+
+
+def probe_summary(meta: Dict[str, Any], records: List[Tuple[int, int, float, float]]) -> Dict[str, Any]:
+    """
+    Reduce probe records to the gain curves before/after the change and the apply
+    delay. Gain is cooked/raw distance along x; the first PROBE_SKIP events after a
+    re-centre are ignored. A change counts as visible at the first of three
+    consecutive cooked events whose gain differs from the baseline by over 10%.
+    """
+    interval = float(meta.get("interval_ms", PROBE_INTERVAL_MS))
+    sums: Dict[Tuple[int, float], List[float]] = {}
+    delay_ratios: List[Tuple[int, float]] = []
+    phase, level = PHASE_BEFORE, None
+    skip_raw = skip_cooked = 0
+    t_set = t_done = None
+    for t_ns, kind, a, b in records:
+        if kind == PROBE_MARK:
+            code = int(a)
+            if code == MARK_PHASE:
+                phase = int(b)
+            elif code == MARK_LEVEL:
+                level = b
+                sums.setdefault((phase, level), [0.0, 0.0])
+            elif code == MARK_LEVEL_END:
+                level = None
+            elif code == MARK_WARP:
+                skip_raw = skip_cooked = PROBE_SKIP
+            elif code == MARK_SET:
+                t_set = t_ns
+            elif code == MARK_SET_DONE:
+                t_done = t_ns
+        elif level is None:
+            continue
+        elif kind == PROBE_RAW:
+            if skip_raw:
+                skip_raw -= 1
+            else:
+                sums[(phase, level)][0] += abs(a)
+        elif kind == PROBE_COOKED:
+            if skip_cooked:
+                skip_cooked -= 1
+                continue
+            sums[(phase, level)][1] += abs(a)
+            if phase == PHASE_DELAY:
+                delay_ratios.append((t_ns, abs(a) / level))
+
+    curves: Dict[str, List[List[float]]] = {"before": [], "after": []}
+    for (ph, lvl), (raw, cooked) in sorted(sums.items()):
+        key = {PHASE_BEFORE: "before", PHASE_AFTER: "after"}.get(ph)
+        if key and raw > 0:
+            curves[key].append([lvl / interval, cooked / raw])
+
+    summary: Dict[str, Any] = {"curves": curves, "set_ms": None, "delay_ms": None,
+                               "delay_after_return_ms": None, "gain_before": None, "gain_after": None}
+    if t_set is None or t_done is None:
+        return summary
+    summary["set_ms"] = (t_done - t_set) / 1e6
+    before = sorted(r for t, r in delay_ratios if t < t_set)
+    if not before:
+        return summary
+    g0 = before[len(before) // 2]
+    summary["gain_before"] = g0
+    tol = max(0.1 * g0, 0.02)
+    later = [(t, r) for t, r in delay_ratios if t >= t_set]
+    for i in range(len(later) - 2):
+        if all(abs(r - g0) > tol for _t, r in later[i:i + 3]):
+            t_change = later[i][0]
+            after = sorted(r for _t, r in later[i:])
+            summary["gain_after"] = after[len(after) // 2]
+            summary["delay_ms"] = (t_change - t_set) / 1e6
+            summary["delay_after_return_ms"] = (t_change - t_done) / 1e6
+            break
+    return summary
+
+def _describe_settings(settings: Dict[str, Any]) -> str:
+    if settings.get("curve"):
+        return f"custom curve ({settings['curve'].get('type', '?')})"
+    return f"{'CTM scale' if settings.get('extended') else 'speed'} {settings.get('speed', 0.0):g}"
+
+def print_probe_report(meta: Dict[str, Any], summary: Dict[str, Any]) -> None:
+    """Human-readable form of probe_summary()."""
+    print(f"Probe: {meta.get('injector')} via \"{meta.get('device')}\" (X id {meta.get('device_id')}), "
+          f"{meta.get('interval_ms', PROBE_INTERVAL_MS):g} ms per event")
+    print(f"Driver properties: {', '.join(meta.get('caps') or []) or 'none of the known ones'}")
+    print(f"Settings: {_describe_settings(meta.get('baseline', {}))} -> {_describe_settings(meta.get('target', {}))}")
+    before = {round(v, 4): g for v, g in summary["curves"]["before"]}
+    after = {round(v, 4): g for v, g in summary["curves"]["after"]}
+    def cell(gain: Optional[float]) -> str:
+        return f"{gain:12.3f}" if gain is not None else f"{'-':>12}"
+
+    print("  units/ms    gain before   gain after")
+    for v in sorted(set(before) | set(after)):
+        print(f"  {v:8.3f}  {cell(before.get(v))}  {cell(after.get(v))}")
+    if summary["set_ms"] is not None:
+        print(f"xinput calls took {summary['set_ms']:.1f} ms")
+    if summary["delay_ms"] is None:
+        print(f"No changed event within {PROBE_DELAY_WINDOW:g} s after the call returned.")
+    else:
+        print(f"First changed event {summary['delay_ms']:.1f} ms after the set started "
+              f"({summary['delay_after_return_ms']:+.1f} ms relative to its return); "
+              f"gain {summary['gain_before']:.3f} -> {summary['gain_after']:.3f}")
+
+
 # --------------------------
 # CLI & main
 # --------------------------
@@ -776,14 +2463,202 @@ def parse_forced_locale(argv: List[str]) -> Optional[str]:
             return arg.split("=", 1)[1]
     return None
 
+def _parse_int_opt(argv: List[str], name: str) -> Optional[int]:
+    """Parse --<name>=<int> from argv; None if absent or not a number."""
+    for arg in argv[1:]:
+        if arg.startswith(f"--{name}="):
+            try:
+                return int(arg.split("=", 1)[1])
+            except ValueError:
+                debug(f"Ignoring invalid value in {arg}")
+    return None
+
+def _parse_str_opt(argv: List[str], name: str) -> Optional[str]:
+    """Parse --<name>=<value> from argv; None if absent."""
+    for arg in argv[1:]:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return None
+
+def _parse_float_opt(argv: List[str], name: str) -> Optional[float]:
+    """Parse --<name>=<float> from argv; None if absent or not a number."""
+    val = _parse_str_opt(argv, name)
+    if val is not None:
+        try:
+            return float(val)
+        except ValueError:
+            debug(f"Ignoring invalid value in --{name}={val}")
+    return None
+
+def run_gc(argv: List[str]) -> int:
+    """
+    --gc: refresh last_seen from the connected devices (if xinput answers), apply
+    the retention policy and print what was removed. Options: --dry-run,
+    --max-age-days=N, --max-by-id=N, --max-whitelist=N (this run only).
+    """
+    cfg = read_config()
+    dry_run = "--dry-run" in argv[1:]
+
+    devices = scan_devices()
+    if devices is None:
+        print("xinput not available: last_seen not refreshed from connected devices.")
+    else:
+        mark_seen(cfg, devices)
+
+    limits = retention_limits(cfg)
+    for key in limits:
+        val = _parse_int_opt(argv, key.replace("_", "-"))
+        if val is not None:
+            limits[key] = max(0, val)
+
+    before = (len(cfg.get("by_id", {})), len(cfg.get("_whitelist", [])))
+    work = copy.deepcopy(cfg) if dry_run else cfg
+    report = gc_config(work, limits=limits)
+    after = (len(work["by_id"]), len(work["_whitelist"]))
+
+    print(f"Retention: max age {limits['max_age_days']} days, "
+          f"max by_id {limits['max_by_id']}, max whitelist {limits['max_whitelist']}")
+    for line in report:
+        print(f"  {line}")
+    print(f"by_id: {before[0]} -> {after[0]} entries; whitelist: {before[1]} -> {after[1]} entries"
+          + (" (dry run, nothing saved)" if dry_run else ""))
+    if not dry_run:
+        write_config(cfg)
+    return 0
+
+def _probe_measure(argv: List[str]) -> Optional[str]:
+    """The --probe measurement run; path of the written probe file, or None (reason printed)."""
+    if not probe_available():
+        print("--probe needs python3-xlib.")
+        return None
+    mode = _parse_str_opt(argv, "probe")
+    if mode is None:
+        mode = "uinput" if scroll_available() and os.access("/dev/uinput", os.W_OK) else "xtest"
+    if mode not in ("uinput", "xtest") or (mode == "uinput" and not scroll_available()):
+        print(f"Unsupported injector {mode!r} (xtest, or uinput with python3-evdev).")
+        return None
+    try:
+        disp = xdisplay.Display()
+    except xerror.DisplayError as e:
+        print(f"Cannot open the X display: {e}")
+        return None
+    if not disp.has_extension("XInputExtension") or not disp.has_extension("XTEST"):
+        print("The X server lacks XInputExtension or XTEST.")
+        return None
+
+    try:
+        injector = XTestInjector(disp) if mode == "xtest" else UInputInjector(disp)
+    except (OSError, evdev.UInputError) as e:
+        print(f"Cannot create the {PROBE_DEVICE_NAME!r} uinput device: {e}")
+        return None
+    try:
+        if injector.device_id is None:
+            print(f"X device {injector.name!r} not found.")
+            return None
+        manager = DeviceManager()
+        caps = probe_capabilities(injector.device_id)
+
+        # Without libinput Accel Speed the speed value is a CTM scale anyway (see _apply_to_device_id)
+        extended = "--probe-extended" in argv[1:]
+        ctm = extended or "libinput Accel Speed" not in caps
+        start = _parse_float_opt(argv, "probe-from")
+        speed = _parse_float_opt(argv, "probe-speed")
+        baseline = {"speed": start if start is not None else (1.0 if ctm else 0.0), "extended": extended}
+        target = {"speed": speed if speed is not None else (2.0 if ctm else 0.5), "extended": extended}
+        profile = _parse_str_opt(argv, "probe-profile")
+        if profile:
+            cfg = manager.get_settings_for(profile, None)
+            if not cfg:
+                print(f"No saved profile named {profile!r}.")
+                return None
+            target = {"speed": float(cfg.get("speed", 0.0)), "extended": bool(cfg.get("extended", False)),
+                      "curve": active_curve(cfg)}
+
+        out = _parse_str_opt(argv, "probe-out") or time.strftime("xinput-plus-probe-%Y%m%d-%H%M%S.bin")
+        info = disp.display.info
+        meta = {"version": 1, "injector": mode, "device": injector.name, "device_id": injector.device_id,
+                "caps": caps, "server": f"{info.vendor} {info.release_number}", "started": int(time.time()),
+                "interval_ms": PROBE_INTERVAL_MS, "baseline": baseline, "target": target}
+        writer = ProbeWriter(out, meta)
+        try:
+            MotionProbe(disp, injector, writer).run(manager, baseline, target)
+        finally:
+            writer.close()
+            manager.restore_accel_profile(injector.device_id)
+    finally:
+        injector.close()
+        disp.close()
+    return out
+
+def run_probe(argv: List[str]) -> int:
+    """
+    --probe[=uinput|xtest]: inject relative motion, record XI2 raw and cooked motion,
+    and report the effective gain curve before and after a setting change plus the
+    delay until the change shows up. Samples are streamed to --probe-out=FILE.
+    Settings: --probe-from=S (baseline), --probe-speed=S, --probe-extended (CTM
+    scales), or --probe-profile=NAME (target from a saved profile).
+    Exit status: 0 ok, 1 change not seen, 2 probe not possible here.
+    """
+    as_json = "--probe-json" in argv[1:]
+    # With --probe-json stdout carries only the summary; messages and debug() lines go to stderr
+    with contextlib.redirect_stdout(sys.stderr) if as_json else contextlib.nullcontext():
+        out = _probe_measure(argv)
+    if out is None:
+        return 2
+
+    meta, records = read_probe(out)
+    summary = probe_summary(meta, records)
+    if as_json:
+        print(json.dumps(summary))
+    else:
+        print_probe_report(meta, summary)
+        print(f"{len(records)} samples written to {out}")
+    return 0 if summary["delay_ms"] is not None else 1
+
+def run_probe_report(argv: List[str]) -> int:
+    """--probe-report=FILE: re-analyse a probe file (add --probe-json for machine-readable output)."""
+    path = _parse_str_opt(argv, "probe-report")
+    try:
+        meta, records = read_probe(path)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read probe file: {e}")
+        return 2
+    summary = probe_summary(meta, records)
+    if "--probe-json" in argv[1:]:
+        print(json.dumps(summary))
+    else:
+        print_probe_report(meta, summary)
+    return 0 if summary["delay_ms"] is not None else 1
+
 def main() -> int:
+    if "--gc" in sys.argv[1:]:
+        return run_gc(sys.argv)
+    if _parse_str_opt(sys.argv, "probe-report") is not None:
+        return run_probe_report(sys.argv)
+    if any(arg == "--probe" or arg.startswith("--probe=") for arg in sys.argv[1:]):
+        return run_probe(sys.argv)
+
     app = QApplication(sys.argv)
 
     forced = parse_forced_locale(sys.argv)
     install_translators(app, forced_locale=forced, verbose=True)
 
-    gui = LibinputGUI()
+    manager = DeviceManager()
+    app.aboutToQuit.connect(manager.shutdown)
+
+    if "--tray" in sys.argv[1:]:
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            app.setQuitOnLastWindowClosed(False)
+            tray = TrayApp(manager)
+            tray.show()
+            manager.start()
+            manager.start_watching(TRAY_WATCH_INTERVAL_MS)
+            return app.exec()
+        debug("No system tray available; opening the main window instead.")
+
+    gui = LibinputGUI(manager)
     gui.show()
+    manager.start()
     return app.exec()
 
 if __name__ == "__main__":